@@ -4,6 +4,7 @@ from product_tile_processor import TileProcessor
 from site_processor import SiteProcessor
 from datetime import datetime
 from collections import defaultdict
+from product_processor import comparison_cache
 
 """This program is a redesign of the availability tracker to be much leaner.
     I realize that we need the availability and the url for the availability check.
@@ -75,7 +76,8 @@ class SiteAvailabilityTracker:
         # After all profiles processed, update DB once
         logging.info(f"AVAIL TRACKER: Total combined seen URLs: {len(all_seen_urls)}")
         # Takes the master list and compares to what is in the DB. If url is in DB but not the master list, mark as sold.
-        self.rds_manager.mark_unseen_products_unavailable(source_name, all_seen_urls)     
+        summary = self.rds_manager.mark_unseen_products_unavailable(source_name, all_seen_urls)
+        comparison_cache.invalidate(summary.get("unavailable_urls", []))
 
 
     def _process_tile_mode(self, site_profile):
@@ -152,8 +154,14 @@ class SiteAvailabilityTracker:
 
                 last_page_urls = current_page_urls
 
-                avail_tile_product_data = [p for p in tile_data if p["available"]]
-                sold_tile_product_data = [p for p in tile_data if not p["available"]]
+                # One pass; a tile without an availability flag is skipped instead of its
+                # KeyError aborting the whole site's tile mode.
+                avail_tile_product_data, sold_tile_product_data = [], []
+                for p in tile_data:
+                    if "available" not in p:
+                        logging.warning(f"AVAIL TRACKER: Tile without 'available' skipped → {p.get('url')}")
+                        continue
+                    (avail_tile_product_data if p["available"] else sold_tile_product_data).append(p)
                 sold_urls = [p["url"] for p in sold_tile_product_data if "url" in p]
 
                 logging.debug(f'AVAIL TRACKER: Available urls count: {len(avail_tile_product_data)}')
@@ -165,6 +173,7 @@ class SiteAvailabilityTracker:
                 if sold_urls:
                     logging.info(f"AVAIL TRACKER: Updating sold products in DB: {len(sold_urls)}")
                     self.rds_manager.mark_urls_as_sold(sold_urls)
+                    comparison_cache.invalidate(sold_urls)
                     already_marked_sold_urls.update(sold_urls)
 
                 all_product_tiles.extend(tile_data)
@@ -250,6 +259,7 @@ class SiteAvailabilityTracker:
         if unseen_urls:
             logging.info(f"AVAIL TRACKER: Marking {len(unseen_urls)} unseen URLs as sold (not found in this scrape).")
             self.rds_manager.mark_urls_as_sold(unseen_urls)
+            comparison_cache.invalidate(unseen_urls)
         else:
             logging.info("AVAIL TRACKER: No unseen products to mark as sold.")
 
@@ -1,9 +1,13 @@
 import json, sys, logging
-from psycopg2 import pool
+import orjson
+from psycopg2 import pool, extras
 from decimal import Decimal
 from datetime import datetime, timezone
+from collections import namedtuple
 from clean_data import CleanData  # if not already imported
 
+ComparisonRow = namedtuple("ComparisonRow", "title price available description price_history in_db")
+
 class AwsRdsManager:
     def __init__(self, credentials_file, openai_manager=None, min_connections=5, max_connections=10):
         """Initialize a PostgreSQL connection pool using credentials from a file."""
@@ -32,7 +36,8 @@ class AwsRdsManager:
             self.db_name     = credentials.get("dataBase")
             self.db_port     = credentials.get("portId")
 
-            self.connection_pool = pool.SimpleConnectionPool(
+            # Threaded: detail pages are processed by several workers sharing this manager.
+            self.connection_pool = pool.ThreadedConnectionPool(
                 min_connections, max_connections,
                 user=self.db_user,
                 password=self.db_password,
@@ -94,8 +99,8 @@ class AwsRdsManager:
         Fetch all existing URLs from the database for comparison.
 
         Returns:
-            dict: A dictionary with URLs as keys and 
-                (title, price, available, description, price_history, in_db) as values.
+            dict: A dictionary with URLs as keys and ComparisonRow
+                (title, price, available, description, price_history, in_db) values.
         """
         try:
             all_url_query = """
@@ -114,13 +119,13 @@ class AwsRdsManager:
 
             for row in all_url_query_result:
                 url = row[0]
-                value_tuple = (
-                    row[1],  # title
-                    float(row[2]) if row[2] else 0.0,
-                    row[3],  # available
-                    row[4],  # description
-                    row[5] if row[5] is not None else "[]",
-                    True
+                value_tuple = ComparisonRow(
+                    title=row[1],
+                    price=float(row[2]) if row[2] else 0.0,
+                    available=row[3],
+                    description=row[4],
+                    price_history=row[5] if row[5] is not None else "[]",
+                    in_db=True
                 )
                 comparison_list[url] = value_tuple
                 total_bytes += sys.getsizeof(url) + sum(sys.getsizeof(v) for v in value_tuple)
@@ -138,6 +143,24 @@ class AwsRdsManager:
 
 
 
+    def execute_returning(self, query, params=None):
+        """
+        Execute a write that has a RETURNING clause, commit it, and return the first row (or None).
+        """
+        connection = self.connection_pool.getconn()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(query, params)
+                row = cursor.fetchone()
+            connection.commit()
+            return row
+        except Exception as e:
+            logging.error(f"Error executing query: {e}")
+            connection.rollback()
+            raise
+        finally:
+            self.connection_pool.putconn(connection)
+
     def get_record_id(self, query, params):
         """
         Fetch a single ID from a query result.
@@ -151,6 +174,25 @@ class AwsRdsManager:
         """
         return self._execute_query(query, params)
 
+    def execute_batch(self, query, params_list, page_size=100):
+        """
+        Run one statement for many parameter tuples, sending page_size statements per
+        round-trip, and commit once at the end.
+        """
+        if not params_list:
+            return
+        connection = self.connection_pool.getconn()
+        try:
+            with connection.cursor() as cursor:
+                extras.execute_batch(cursor, query, params_list, page_size=page_size)
+            connection.commit()
+        except Exception as e:
+            logging.error(f"Error executing batch: {e}")
+            connection.rollback()
+            raise
+        finally:
+            self.connection_pool.putconn(connection)
+
     def close(self):
         """
         Close the connection pool.
@@ -207,7 +249,7 @@ class AwsRdsManager:
             clean_details_data (dict): The clean product details to upload.
 
         Returns:
-            None
+            int | None: The new row's id, or None if nothing was inserted.
         """
         try:
             from clean_data import CleanData  # if not already imported
@@ -222,7 +264,7 @@ class AwsRdsManager:
             """
             if self.fetch(existing_check, (url,)):
                 logging.warning(f"RDS MANAGER: Skipping insert — product already exists for URL: {url}")
-                return
+                return None
 
             # ✅ Generate OpenAI vector from title and description
             if self.openai_manager:
@@ -245,37 +287,38 @@ class AwsRdsManager:
             clean_details_data["last_seen"] = now_utc
             clean_details_data["date_sold"] = None if is_available else now_utc
 
-            # ✅ Filter out empty fields
+            # ✅ Filter out empty fields, convert Decimals and JSON serialize lists in one pass
             required_fields = {"date_sold", "date_collected", "date_modified", "last_seen"}
-            filtered_data = {
-                k: v for k, v in clean_details_data.items()
-                if v not in ("", [], {}) or k in required_fields
-            }
+            json_fields = {"original_image_urls", "categories_site_designated"}
+            filtered_data = {}
+            for key, value in clean_details_data.items():
+                if value in ("", [], {}) and key not in required_fields:
+                    continue
+                if isinstance(value, Decimal):
+                    value = float(value)
+                if key in json_fields:
+                    value = orjson.dumps(value, default=float).decode("utf-8")
+                filtered_data[key] = value
 
             logging.debug(f"RDS_MGR: Filtered data for insertion: {filtered_data.keys()}")
             logging.debug(f"RDS_MGR: Prepared data for insertion: {filtered_data}")
 
-            # ✅ Convert Decimal fields and JSON serialize lists
-            json_fields = ["original_image_urls", "categories_site_designated"]
-            for key, value in filtered_data.items():
-                if isinstance(value, Decimal):
-                    filtered_data[key] = float(value)
-                if key in json_fields:
-                    filtered_data[key] = json.dumps(value, default=float)
-
             # ✅ Insert into database
             columns = ", ".join(filtered_data.keys())
             placeholders = ", ".join(["%s"] * len(filtered_data))
             insert_query = f"""
             INSERT INTO militaria ({columns})
             VALUES ({placeholders})
+            RETURNING id
             """
 
-            self.execute(insert_query, tuple(filtered_data.values()))
+            row = self.execute_returning(insert_query, tuple(filtered_data.values()))
             logging.info(f"Successfully inserted product: {clean_details_data.get('title')}")
+            return row[0] if row else None
 
         except Exception as e:
             logging.error(f"Error inserting product to RDS: {e}")
+            return None
 
 
     # I think this is not needed anymore. Need to check if it is used anywhere.
@@ -313,7 +356,7 @@ class AwsRdsManager:
             # Ensure we don’t pass empty tuples (Postgres fails with empty IN clause)
             if not seen_urls:
                 logging.warning("RDS MANAGER: Empty seen_urls list provided — skipping update.")
-                return {"marked_unavailable": 0, "date_sold_set": 0}
+                return {"marked_unavailable": 0, "date_sold_set": 0, "unavailable_urls": []}
 
             unseen_tuple = tuple(seen_urls)
 
@@ -322,7 +365,7 @@ class AwsRdsManager:
                 UPDATE militaria
                 SET available = FALSE
                 WHERE site = %s AND url NOT IN %s AND available = TRUE
-                RETURNING id;
+                RETURNING url;
             """
             unavailable_result = self.fetch(update_avail_query, (site_name, unseen_tuple))
             marked_unavailable = len(unavailable_result)
@@ -339,12 +382,13 @@ class AwsRdsManager:
 
             return {
                 "marked_unavailable": marked_unavailable,
-                "date_sold_set": date_sold_set
+                "date_sold_set": date_sold_set,
+                "unavailable_urls": [row[0] for row in unavailable_result]
             }
 
         except Exception as e:
             logging.error(f"RDS MANAGER: Error marking unseen products as unavailable: {e}")
-            return {"marked_unavailable": 0, "date_sold_set": 0}
+            return {"marked_unavailable": 0, "date_sold_set": 0, "unavailable_urls": []}
 
     def mark_urls_as_sold(self, url_list):
         """
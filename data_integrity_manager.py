@@ -6,7 +6,7 @@ from product_tile_processor import TileProcessor
 from site_processor import SiteProcessor
 import image_extractor
 from time import sleep
-from openai_api_manager import OpenAIManager
+from openai_api_manager import OpenAIManager, BATCH_PENDING_STATES
 import signal
 from multiprocessing import Pool, cpu_count
 from functools import partial
@@ -46,6 +46,7 @@ class DataIntegrityManager:
         2. Generate thumbnails from first S3 image
         3. Recover datapoints with URL
         4. Generate OpenAI vector embeddings
+        5. Bulk classification backfill (OpenAI Batch API)
         (Press Enter to exit)
         """)
         choice = input("Select an option: ").strip()
@@ -69,6 +70,19 @@ class DataIntegrityManager:
                 tool.run_all_parallel()
             else:
                 tool.run_all()
+        elif choice == "5":
+            settings = self.managers.get("user_settings") or {}
+            tool = BatchClassificationBackfill(
+                self.rds_manager, self.openai_manager,
+                settings.get("openaiBatchStatePath", "openai_batches.json")
+            )
+            action = input("[s]ubmit a new batch or [c]ollect finished ones? ").strip().lower()
+            if action == "s":
+                tool.submit()
+            elif action == "c":
+                tool.collect()
+            else:
+                print("No action selected.")
         else:
             print("Exited integrity submenu.")
 
@@ -705,11 +719,19 @@ class VectorEmbeddingGenerator:
         rows = self.rds_manager.fetch(query, (self.batch_size, offset))
         logging.info(f"🔄 Processing batch at offset {offset} — {len(rows)} rows")
 
-        for row in rows:
+        # One embeddings request for the whole batch instead of one per row.
+        texts = [f"{title or ''} {description or ''}".strip() for _, title, description in rows]
+        vectors = self.openai_manager.generate_vectors_bulk(texts)
+
+        for (db_id, _, _), text, vector in zip(rows, texts, vectors):
             if self.stop_requested:
                 logging.warning("⏹️ Stop requested. Ending after this batch.")
                 break
-            self.process_row(row)
+            if not text:
+                logging.warning(f"⚠️ Empty input for DB ID {db_id} — skipping.")
+                continue
+            if vector:
+                self.update_vector(db_id, vector)
 
     def run_all_parallel(self):
         query = """
@@ -793,20 +815,22 @@ class MissingClassificationFixer:
 
             logging.info(f"\n🔁 Batch {batch_num}: Found {len(rows)} items with ≥ {required_missing} missing fields...")
 
-            for row in rows:
-                product_id, title, description, image_url = row
+            items = [
+                (
+                    title if isinstance(title, str) else "",
+                    description if isinstance(description, str) else "",
+                    image_url if isinstance(image_url, str) else ""
+                )
+                for _, title, description, image_url in rows
+            ]
+            # Several rows share each OpenAI request; rows the shared request misses are
+            # classified one by one, concurrently. The writes below stay in row order.
+            results = self.classifier.classify_batch(items)
 
-                try:
-                    title = title if isinstance(title, str) else ""
-                    description = description if isinstance(description, str) else ""
-                    image_url = image_url if isinstance(image_url, str) else ""
-
-                    result = self.classifier.classify_single_product(
-                        title=title,
-                        description=description,
-                        image_url=image_url
-                    )
+            for row, (title, description, image_url), result in zip(rows, items, results):
+                product_id = row[0]
 
+                try:
                     if all(v is None for v in result.values()):
                         total_skipped += 1
                         logging.warning(f"Skipping update — classification returned nothing for ID {product_id}")
@@ -881,6 +905,118 @@ class MissingClassificationFixer:
         logging.info(f"Updated classification for: {url}")
 
 
+class BatchClassificationBackfill:
+    """
+    Backfills missing AI classifications through the OpenAI Batch API (half price, done
+    within 24h). submit() queues unclassified rows and records the batch in a JSON state
+    file; collect() checks every recorded batch and writes back the finished ones.
+    """
+    SUBMIT_LIMIT = 10000
+
+    def __init__(self, rds_manager, classifier, state_path):
+        self.rds = rds_manager
+        self.classifier = classifier
+        self.state_path = state_path
+
+    def _load_state(self):
+        # {batch_id: [product ids in that batch]}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.error(f"BATCH BACKFILL: Failed to read {self.state_path}: {e}")
+            raise
+
+    def _save_state(self, state):
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def submit(self, limit=SUBMIT_LIMIT):
+        state = self._load_state()
+        # Rows already waiting in an earlier batch are not queued twice.
+        in_flight = [product_id for ids in state.values() for product_id in ids]
+        rows = self.rds.fetch(
+            """
+            SELECT id, title, description, s3_first_image_thumbnail
+            FROM militaria
+            WHERE (conflict_ai_generated IS NULL OR conflict_ai_generated = '')
+            AND (nation_ai_generated IS NULL OR nation_ai_generated = '')
+            AND (item_type_ai_generated IS NULL OR item_type_ai_generated = '')
+            AND NOT (id = ANY(%s))
+            LIMIT %s;
+            """,
+            (in_flight, limit)
+        )
+        if not rows:
+            logging.info("BATCH BACKFILL: No unclassified rows to submit.")
+            return None
+
+        items = [
+            (
+                product_id,
+                title if isinstance(title, str) else "",
+                description if isinstance(description, str) else "",
+                image_url if isinstance(image_url, str) else None
+            )
+            for product_id, title, description, image_url in rows
+        ]
+        batch_id = self.classifier.submit_batch(items)
+        if not batch_id:
+            return None
+
+        state[batch_id] = [row[0] for row in rows]
+        self._save_state(state)
+        logging.info(f"BATCH BACKFILL: Submitted {len(rows)} rows as batch {batch_id}")
+        return batch_id
+
+    def collect(self):
+        state = self._load_state()
+        if not state:
+            logging.info("BATCH BACKFILL: No batches waiting.")
+            return
+
+        update_query = """
+            UPDATE militaria
+            SET conflict_ai_generated = %s,
+                nation_ai_generated = %s,
+                item_type_ai_generated = %s,
+                supergroup_ai_generated = %s
+            WHERE id = %s;
+        """
+        for batch_id in list(state):
+            status, results = self.classifier.collect_batch(batch_id)
+            if status is None or status in BATCH_PENDING_STATES:
+                logging.info(f"BATCH BACKFILL: Batch {batch_id} not finished ({status}), keeping it.")
+                continue
+
+            params = [
+                (
+                    result["conflict_ai_generated"],
+                    result["nation_ai_generated"],
+                    result["item_type_ai_generated"],
+                    result["supergroup_ai_generated"],
+                    int(custom_id)
+                )
+                for custom_id, result in results.items() if result
+            ]
+            try:
+                self.rds.execute_batch(update_query, params)
+            except Exception as e:
+                logging.error(f"BATCH BACKFILL: Failed to write batch {batch_id}, keeping it: {e}")
+                continue
+
+            # Rows the batch could not classify stay unclassified for the next submit or rerun.
+            logging.info(
+                f"BATCH BACKFILL: Batch {batch_id} {status} — wrote {len(params)} of {len(state[batch_id])} rows"
+            )
+            del state[batch_id]
+            self._save_state(state)
+
+
 def process_row_parallel(row, openai_api_key, db_credentials):
     from openai import OpenAI
     import psycopg2
@@ -1,12 +1,14 @@
 import requests
 import logging
+import threading
 import time
+from urllib.parse import urlsplit
 from bs4 import BeautifulSoup
 from requests.exceptions import RequestException, Timeout
 
 
 class HtmlManager:
-    def __init__(self, user_agent=None, retries=3, backoff_factor=2, timeout=20, cookies=None):
+    def __init__(self, user_agent=None, retries=3, backoff_factor=2, timeout=20, cookies=None, min_interval=0.5):
         self.headers = {
             "User-Agent": user_agent or (
                 "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -39,13 +41,32 @@ class HtmlManager:
         self.backoff_factor = backoff_factor
         self.timeout = timeout
 
+        # Politeness: requests to one host start at least min_interval seconds apart, however
+        # many detail workers share this manager.
+        self.min_interval = min_interval
+        self._next_request = {}
+        self._throttle_lock = threading.Lock()
+
         if cookies:
             for name, value in cookies.items():
                 self.session.cookies.set(name, value)
 
 
+    def _throttle(self, url):
+        if self.min_interval <= 0:
+            return
+        host = urlsplit(url).netloc
+        # Reserve the next slot for this host under the lock, then sleep outside it.
+        with self._throttle_lock:
+            now = time.monotonic()
+            start = max(now, self._next_request.get(host, 0.0))
+            self._next_request[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
     def fetch_url(self, url):
         for attempt in range(self.retries):
+            self._throttle(url)
             try:
                 response = self.session.get(url, headers=self.headers, timeout=self.timeout)
                 response.raise_for_status()
@@ -112,14 +133,14 @@ class HtmlManager:
             logging.error(f"HTML MGR: Error extracting data with config {selector_config}: {e}")
             return None
 
-    def parse_html(self, url, parser="html.parser"):
-        # Parse a URL into a BeautifulSoup object.
+    def parse_html(self, url, parser="html.parser", parse_only=None):
+        # Parse a URL into a BeautifulSoup object; parse_only (a SoupStrainer) keeps just the matching tags.
         response = self.fetch_url(url)
         if not response:
             return None
         
         try:
-            return BeautifulSoup(response.content, parser)
+            return BeautifulSoup(response.content, parser, parse_only=parse_only)
         except Exception as e:
             logging.error(f"HTML MGR: Error occurred while parsing the page {url}: {e}")
             return None
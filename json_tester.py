@@ -15,19 +15,12 @@ class JsonTester:
         self.counter = managers.get('counter')
         self.html_manager = managers.get('html_manager')
 
-    def apply_post_processing(self, value, config):
+    def apply_post_processing(self, value, config, soup=None):
+        # Same pipeline the scrapers use, so text processors see normalized input here too.
         post_process_config = config.get("post_process", None)
         if not post_process_config or not isinstance(post_process_config, dict):
             return value
-
-        for func_name, arg in post_process_config.items():
-            try:
-                func = getattr(post_processors, func_name, None)
-                if func:
-                    value = func(value, arg) if not isinstance(arg, bool) else func(value)
-            except Exception as e:
-                logging.error(f"Post-processing error with function '{func_name}': {e}")
-        return value
+        return post_processors.apply_post_processors(value, post_process_config, soup=soup)
 
     def load_site_profile(self, json_file):
         try:
@@ -60,7 +53,7 @@ class JsonTester:
 
             # Apply post-processing on the element before extracting text or attribute
             if "post_process" in selector_config:
-                value = self.apply_post_processing(element, selector_config)
+                value = self.apply_post_processing(element, selector_config, soup=soup)
             else:
                 value = element.get(attribute, "").strip() if attribute else element.get_text(strip=True)
 
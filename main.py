@@ -20,7 +20,6 @@ def main():
         logging.error("Error retrieving user settings.")
         exit()
 
-    run_mode = user_settings.get("run_mode", "both")
     pages_to_check = user_settings.get("pages_to_check", 1)
     availability_sleeptime = user_settings.get("availability_sleeptime", 900)
     scrape_sleeptime = user_settings.get("scrape_sleeptime", 3600)
@@ -40,6 +39,17 @@ def main():
         logging.error("Error setting up object managers.")
         exit()
 
+    # The shared OpenAI manager holds a pooled HTTP client and the SQLite cache handle;
+    # close it however the run ends (data integrity return, exit(), Ctrl+C or an error).
+    with managers["openai_manager"]:
+        run_modes(user_settings, managers)
+
+
+def run_modes(user_settings, managers):
+    run_mode = user_settings.get("run_mode", "both")
+    availability_sleeptime = user_settings.get("availability_sleeptime", 900)
+    scrape_sleeptime = user_settings.get("scrape_sleeptime", 3600)
+
     log_print = managers.get("log_print")
     counter = managers.get("counter")
     json_manager = managers.get("jsonManager")
@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 import logging
 import os
+import threading
 import time
 from dataclasses import dataclass
 from typing import Optional, Dict, Any, Tuple
@@ -203,6 +204,8 @@ class MLManager:
         self.nation_pipe = None
         self.nation_classes = None
         self._loaded = False
+        # Detail workers can hit predict() for the first time together; only one loads.
+        self._load_lock = threading.Lock()
 
     # ---------------------------
     # Public API
@@ -213,7 +216,12 @@ class MLManager:
         if self._loaded:
             logger.debug("MLManager.load: already loaded; returning cached state.")
             return self
+        with self._load_lock:
+            if not self._loaded:
+                self._load_pipelines()
+        return self
 
+    def _load_pipelines(self) -> None:
         logger.info("MLManager.load: starting")
         logger.info(f"Settings: enable_item_type={self.enable_item_type}, enable_conflict={self.enable_conflict}, enable_nation={self.enable_nation}")
 
@@ -266,7 +274,6 @@ class MLManager:
 
         self._loaded = True
         logger.info("MLManager.load: completed")
-        return self
 
     def info(self) -> dict:
         """Minimal metadata for debugging/telemetry."""
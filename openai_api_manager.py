@@ -1,6 +1,98 @@
-import json
+import os
+import re
+import orjson
+import time
+import random
+import hashlib
 import logging
+import sqlite3
+import threading
+import httpx
 import openai
+from collections import OrderedDict
+from itertools import islice
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+CONFLICT_ENUM = (
+    "PRE_19TH", "19TH_CENTURY", "PRE_WW1", "WW1", "PRE_WW2", "WW2",
+    "COLD_WAR", "VIETNAM_WAR", "KOREAN_WAR", "CIVIL_WAR", "MODERN", "UNKNOWN"
+)
+
+NATION_ENUM = (
+    "GERMANY", "UNITED KINGDOM", "USA", "JAPAN", "FRANCE", "CANADA",
+    "AUSTRALIA", "RUSSIA", "ITALY", "NETHERLANDS", "POLAND", "AUSTRIA",
+    "BELGIUM", "CHINA", "VIETNAM", "SOUTH KOREA", "NORTH KOREA", "ISRAEL",
+    "CZECHOSLOVAKIA", "HUNGARY", "SPAIN", "SWEDEN", "FINLAND", "INDIA",
+    "UNKNOWN", "OTHER ALLIED FORCES", "OTHER AXIS FORCES", "OTHER EUROPEAN",
+    "OTHER AMERICAN", "OTHER MIDDLE EAST", "OTHER AFRICAN", "OTHER OCEANIC",
+    "OTHER ASIAN", "OTHER"
+)
+
+# Prompts stay short; per-field guidance lives in the schema descriptions below.
+SYSTEM_PROMPT = (
+    "You are a military historian AI classifying collectibles. "
+    "Call classify_item; use only the provided enums."
+)
+
+BATCH_SYSTEM_PROMPT = (
+    "You are a military historian AI classifying collectibles. "
+    "Return one classification per numbered item, keyed by its index; use only the provided enums."
+)
+
+SUPERGROUP_SYSTEM_PROMPT = "You are a military historian AI. Pick the supergroup that best fits the item."
+
+MAIN_FIELDS_SYSTEM_PROMPT = "You are a military historian AI classifying collectibles. Use only the provided enums."
+
+# Built once; only the item_type / supergroup enums vary and those are cached per manager.
+_CONFLICT_SCHEMA = {
+    "type": "string",
+    "enum": list(CONFLICT_ENUM),
+    "description": (
+        "Era of manufacture or use. PRE_19TH=before 1800, 19TH_CENTURY=1800-1899, "
+        "CIVIL_WAR=US Civil War 1861-1865, PRE_WW1=1900-1913, WW1=1914-1918, "
+        "PRE_WW2=interwar 1919-1938, WW2=1939-1945, KOREAN_WAR=1950-1953, "
+        "VIETNAM_WAR=1955-1975, COLD_WAR=other 1946-1991, MODERN=after 1991, "
+        "UNKNOWN=cannot be determined."
+    )
+}
+_NATION_SCHEMA = {
+    "type": "string",
+    "enum": list(NATION_ENUM),
+    "description": (
+        "Nation that made or issued the item. Use the OTHER ... regional values "
+        "(e.g. OTHER EUROPEAN, OTHER ALLIED FORCES) for countries not listed, "
+        "UNKNOWN when it cannot be determined."
+    )
+}
+_ITEM_TYPE_DESCRIPTION = "Most specific category for the item; it must belong to the chosen supergroup."
+_SUPERGROUP_DESCRIPTION = "Broad group the item belongs to, judged by its purpose and form."
+
+# Store announcements rather than products: the title has to open with the announcement
+# phrase, so product titles that merely mention a sale ("M35 helmet - REDUCED PRICE") still
+# go to the model.
+_AD_RX = re.compile(
+    r"^\W*(reduced prices?|price reductions?|added \d+\+? new|new items? added|upcoming auctions?|"
+    r"category updated|sale alert|new listings)\b",
+    re.I
+)
+
+# Batch API states in which collect_batch has nothing to return yet; any other state is final.
+BATCH_PENDING_STATES = frozenset(("validating", "in_progress", "finalizing", "cancelling"))
+
+# Transient failures worth another attempt; anything else is a real error.
+_RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+# Shared across manager instances (e.g. one per worker); these files do not change mid-run.
+@lru_cache(maxsize=4)
+def _load_key(path):
+    with open(path, "rb") as file:
+        return orjson.loads(file.read())["key"]
+
+@lru_cache(maxsize=8)
+def _load_json(path):
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
 
 class OpenAIManager:
     def __init__(self, settings):
@@ -10,42 +102,401 @@ class OpenAIManager:
         self.model = settings.get("openaiModel", "gpt-5-mini")
         self.fallback_model = settings.get("openaiFallbackModel", "gpt-5")
         self.confidence_threshold = settings.get("openaiConfidenceThreshold", 0.9)
+        self.retries = settings.get("openaiRetries", 6)
+        self.backoff_max = settings.get("openaiBackoffMax", 30)
 
         self.api_key = self._load_api_key()
-        self.client = openai.OpenAI(api_key=self.api_key)
+
+        # One long-lived pooled client so TCP/TLS handshakes are paid once, not per call.
+        self.http_client = httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0),
+            timeout=httpx.Timeout(60.0, connect=5.0)
+        )
+        self.client = openai.OpenAI(api_key=self.api_key, http_client=self.http_client)
 
         self._category_data_cache = None
         self._supergroup_data_cache = None
 
+        # Content-addressed result cache: in-process LRU in front of an optional SQLite file.
+        self._result_cache = OrderedDict()
+        self._result_cache_size = settings.get("openaiCacheSize", 10000)
+        # Embeddings are 1536 floats each, so they get their own, much smaller LRU.
+        self._embedding_cache = OrderedDict()
+        self._embedding_cache_size = settings.get("openaiEmbeddingCacheSize", 256)
+        self._cache_lock = threading.Lock()
+        # SQLite access has its own lock so disk I/O never blocks in-memory cache hits.
+        self._db_lock = threading.Lock()
+        self._cache_db = self._open_cache_db(settings.get("openaiCachePath"))
+
+        # Tool schemas keyed by their enum, so each is built once per manager.
+        self._tool_cache = {}
+        self._classification_version = None
+
+        # Derived lookups, built once alongside the JSON caches above.
+        self._item_type_union = None
+        self._labels_by_supergroup = None
+        self._valid_pairs = None
+        self._supergroup_enum = None
+        self._ad_category = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        try:
+            self.client.close()
+            if self._cache_db is not None:
+                self._cache_db.close()
+        except Exception as e:
+            logging.error(f"OpenAIManager: Failed to close client: {e}")
+
+    def _open_cache_db(self, path):
+        if not path:
+            return None
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute("CREATE TABLE IF NOT EXISTS openai_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.commit()
+            return conn
+        except Exception as e:
+            logging.error(f"OpenAIManager: Failed to open cache at {path}, using memory only: {e}")
+            return None
+
+    def _cache_key(self, *parts):
+        return hashlib.md5("|".join(str(p or "") for p in parts).encode("utf-8")).hexdigest()
+
+    def _classification_key(self, title, description, image_url=None):
+        return self._cache_key(self.model, self._get_classification_version(), title, description, image_url)
+
+    def _get_classification_version(self):
+        """
+        Hash of the prompts, tool schemas and taxonomy behind every classification. It is part
+        of each cache key, so changing any of them stops the persistent cache serving old answers.
+        """
+        if self._classification_version is None:
+            self.get_category_data()
+            self.get_supergroup_data()
+            fingerprint = orjson.dumps([
+                SYSTEM_PROMPT, BATCH_SYSTEM_PROMPT, SUPERGROUP_SYSTEM_PROMPT, MAIN_FIELDS_SYSTEM_PROMPT,
+                self._combined_tool(), self._batch_tool(), self._supergroup_tool(self._supergroup_enum),
+                self._labels_by_supergroup
+            ], option=orjson.OPT_SORT_KEYS)
+            self._classification_version = hashlib.md5(fingerprint).hexdigest()
+        return self._classification_version
+
+    def _cache_get(self, key, embedding=False):
+        lru = self._embedding_cache if embedding else self._result_cache
+        with self._cache_lock:
+            if key in lru:
+                lru.move_to_end(key)
+                return lru[key]
+        if self._cache_db is None:
+            return None
+        try:
+            with self._db_lock:
+                row = self._cache_db.execute("SELECT value FROM openai_cache WHERE key = ?", (key,)).fetchone()
+        except Exception as e:
+            logging.error(f"OpenAIManager: Cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        value = orjson.loads(row[0])
+        self._cache_set(key, value, persist=False, embedding=embedding)
+        return value
+
+    def _cache_set(self, key, value, persist=True, embedding=False):
+        self._cache_set_many([(key, value)], persist=persist, embedding=embedding)
+
+    def _cache_set_many(self, pairs, persist=True, embedding=False):
+        """
+        Put (key, value) pairs in the matching LRU and, when persisting, write them
+        to SQLite in one statement with a single commit.
+        """
+        if not pairs:
+            return
+        lru, size = (
+            (self._embedding_cache, self._embedding_cache_size) if embedding
+            else (self._result_cache, self._result_cache_size)
+        )
+        with self._cache_lock:
+            for key, value in pairs:
+                lru[key] = value
+                lru.move_to_end(key)
+            while len(lru) > size:
+                lru.popitem(last=False)
+        if persist and self._cache_db is not None:
+            try:
+                rows = [(key, orjson.dumps(value).decode("utf-8")) for key, value in pairs]
+                with self._db_lock:
+                    self._cache_db.executemany(
+                        "INSERT OR REPLACE INTO openai_cache (key, value) VALUES (?, ?)", rows
+                    )
+                    self._cache_db.commit()
+            except Exception as e:
+                logging.error(f"OpenAIManager: Cache write failed: {e}")
+
+    def _with_retry(self, fn, **kwargs):
+        """
+        Call an OpenAI client method, retrying rate limits, connection drops and
+        5xx responses with jittered exponential backoff. Other errors propagate.
+        """
+        for attempt in range(self.retries):
+            try:
+                return fn(**kwargs)
+            except _RETRYABLE_ERRORS as e:
+                if attempt == self.retries - 1:
+                    raise
+                delay = random.uniform(1, min(self.backoff_max, 2 ** (attempt + 1)))
+                logging.warning(f"OpenAIManager: Transient error (Attempt {attempt + 1}/{self.retries}): {e}. Retrying in {delay:.1f}s")
+                time.sleep(delay)
+
     def _load_api_key(self):
-        with open(self.openai_cred_path, "r") as file:
-            data = json.load(file)
-            return data["key"]
+        return _load_key(self.openai_cred_path)
 
     def get_category_data(self):
         if self._category_data_cache is None:
-            with open(self.categories_path, "r", encoding="utf-8") as f:
-                self._category_data_cache = json.load(f)
+            data = _load_json(self.categories_path)
+
+            labels_by_supergroup = {}
+            for c in data:
+                labels_by_supergroup.setdefault(c["supergroup"], []).append(c["label"])
+
+            self._labels_by_supergroup = labels_by_supergroup
+            self._item_type_union = sorted({c["label"] for c in data})
+            self._valid_pairs = frozenset((c["supergroup"], c["label"]) for c in data)
+            self._ad_category = next(
+                ((c["supergroup"], c["label"]) for c in data if c["label"].strip().upper() == "SITE ADVERTISEMENTS"),
+                None
+            )
+            self._category_data_cache = data
         return self._category_data_cache
 
     def get_supergroup_data(self):
         if self._supergroup_data_cache is None:
-            with open(self.supergroups_path, "r", encoding="utf-8") as f:
-                self._supergroup_data_cache = json.load(f)
+            data = _load_json(self.supergroups_path)
+            self._supergroup_enum = [sg["key"] for sg in data]
+            self._supergroup_data_cache = data
         return self._supergroup_data_cache
 
     def classify_single_product(self, title, description, image_url=None):
+        advert = self._advertisement_result(title)
+        if advert is not None:
+            return advert
+
+        key = self._classification_key(title, description, image_url)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return dict(cached)
+
+        result = self._classify_single_product(title, description, image_url)
+
+        # Cheap model first; escalate only when it could not place the item on either axis.
+        if self._is_low_confidence(result) and self.fallback_model and self.fallback_model != self.model:
+            logging.info(f"AI CLASSIFICATION: Low confidence from {self.model}, retrying with {self.fallback_model}")
+            retry = self._classify_single_product(title, description, image_url, model=self.fallback_model)
+            if self._is_complete(retry):
+                result = retry
+
+        # Failures come back with empty fields; caching them would replay the failure forever.
+        if self._is_complete(result):
+            self._cache_set(key, dict(result))
+        return result
+
+    def _stream_tool_call(self, **kwargs):
+        """
+        Stream a forced single-tool completion and return its parsed arguments as soon
+        as the JSON is complete, closing the stream instead of waiting for the tail.
+        """
+        stream = self._with_retry(self.client.chat.completions.create, stream=True, **kwargs)
+        buffer = []
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                for tool_call in chunk.choices[0].delta.tool_calls or []:
+                    if tool_call.function and tool_call.function.arguments:
+                        buffer.append(tool_call.function.arguments)
+                if buffer and buffer[-1].rstrip().endswith("}"):
+                    try:
+                        return orjson.loads("".join(buffer))
+                    except ValueError:
+                        continue
+        finally:
+            stream.close()
+        return orjson.loads("".join(buffer))
+
+    def _classification_payload(self, title, description, image_url=None, model=None):
+        return {
+            "model": model or self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": SYSTEM_PROMPT
+                },
+                self._user_message(title, description, image_url)
+            ],
+            "tools": [self._combined_tool()],
+            "tool_choice": {"type": "function", "function": {"name": "classify_item"}},
+            "temperature": 1
+        }
+
+    def submit_batch(self, items):
+        """
+        Queue (custom_id, title, description, image_url) items on the OpenAI Batch API,
+        which completes within 24h at half the token price. Returns the batch id.
+        """
+        try:
+            self.get_category_data()
+            self.get_supergroup_data()
+
+            lines = []
+            for custom_id, title, description, *rest in items:
+                image_url = rest[0] if rest else None
+                lines.append(orjson.dumps({
+                    "custom_id": str(custom_id),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._classification_payload(title, description, image_url)
+                }))
+
+            batch_file = self._with_retry(
+                self.client.files.create,
+                file=("classification_batch.jsonl", b"\n".join(lines)),
+                purpose="batch"
+            )
+            batch = self._with_retry(
+                self.client.batches.create,
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            logging.info(f"OpenAIManager: Submitted batch {batch.id} with {len(lines)} items")
+            return batch.id
+
+        except Exception as e:
+            logging.error(f"OpenAIManager: Failed to submit batch: {e}")
+            return None
+
+    def collect_batch(self, batch_id):
+        """
+        Returns (status, results) for a batch from submit_batch.
+
+        - status in BATCH_PENDING_STATES: results is None; poll again later.
+        - any other status is final ("completed", "failed", "expired", "cancelled"):
+          results is {custom_id: result} for every request the batch got to. Requests
+          that failed inside the batch, or that the model answered with an invalid
+          supergroup/item_type pair, map to None so the caller can re-run them through
+          classify_single_product. A batch that failed validation returns {}.
+        - (None, None) if the batch could not be checked at all (e.g. network error).
+
+        Driven by data_integrity_manager.BatchClassificationBackfill.
+        """
+        try:
+            batch = self._with_retry(self.client.batches.retrieve, batch_id=batch_id)
+            status = batch.status
+            if status in BATCH_PENDING_STATES:
+                logging.info(f"OpenAIManager: Batch {batch_id} is {status}")
+                return status, None
+            if status != "completed":
+                logging.error(f"OpenAIManager: Batch {batch_id} ended as {status}")
+
+            self.get_category_data()
+            results = {}
+            # Expired/cancelled batches still publish whatever finished before they stopped.
+            if batch.output_file_id:
+                for entry in self._batch_file_entries(batch.output_file_id):
+                    results[entry.get("custom_id")] = self._batch_entry_result(entry)
+            if batch.error_file_id:
+                for entry in self._batch_file_entries(batch.error_file_id):
+                    results[entry.get("custom_id")] = None
+            return status, results
+
+        except Exception as e:
+            logging.error(f"OpenAIManager: Failed to collect batch {batch_id}: {e}")
+            return None, None
+
+    def _batch_file_entries(self, file_id):
+        content = self._with_retry(self.client.files.content, file_id=file_id)
+        for line in content.text.splitlines():
+            if line.strip():
+                yield orjson.loads(line)
+
+    def _batch_entry_result(self, entry):
+        """Formatted result for one output line, or None if the request or its answer is unusable."""
+        try:
+            response = entry["response"]
+            if response.get("status_code", 200) != 200:
+                return None
+            message = response["body"]["choices"][0]["message"]
+            fields = orjson.loads(message["tool_calls"][0]["function"]["arguments"])
+        except (KeyError, IndexError, TypeError, ValueError, AttributeError):
+            return None
+
+        if (fields.get("supergroup"), fields.get("item_type")) not in self._valid_pairs:
+            return None
+
+        result = self._format_main_fields(fields)
+        result["supergroup_ai_generated"] = fields["supergroup"]
+        return result
+
+    def _advertisement_result(self, title):
+        """
+        Short-circuit obvious site announcements without an API call. Only active when
+        the taxonomy actually has a SITE ADVERTISEMENTS label to assign.
+        """
+        self.get_category_data()
+        if self._ad_category is None or not _AD_RX.search(title or ""):
+            return None
+        supergroup, label = self._ad_category
+        return {
+            "conflict_ai_generated": "UNKNOWN",
+            "nation_ai_generated": "UNKNOWN",
+            "item_type_ai_generated": label.upper(),
+            "supergroup_ai_generated": supergroup
+        }
+
+    def _is_complete(self, result):
+        """True when every classification field is set, i.e. the result is safe to cache."""
+        return all(result.get(field) for field in (
+            "item_type_ai_generated", "conflict_ai_generated",
+            "nation_ai_generated", "supergroup_ai_generated"
+        ))
+
+    def _is_low_confidence(self, result):
+        return result.get("conflict_ai_generated") == "UNKNOWN" and result.get("nation_ai_generated") == "UNKNOWN"
+
+    def _classify_single_product(self, title, description, image_url=None, model=None):
         try:
-            # Step 1: Get supergroup
-            supergroup = self._classify_supergroup(title, description, image_url)
-            if not supergroup:
-                return self._empty_result()
+            self.get_category_data()
+            self.get_supergroup_data()
+
+            # One round-trip: a single forced tool returns supergroup and main fields together.
+            # item_type is drawn from the union of all categories and validated client-side below.
+            fields = self._stream_tool_call(**self._classification_payload(title, description, image_url, model))
 
-            # Step 2: Use supergroup to restrict categories
-            categories = self.get_category_data()
-            valid_types = [c["label"] for c in categories if c["supergroup"] == supergroup]
+            supergroup = fields.get("supergroup")
+            if supergroup not in self._labels_by_supergroup:
+                # Missing or unrecognised supergroup; ask for it on its own.
+                supergroup = self._classify_supergroup(title, description, image_url, model=model)
+                if not supergroup:
+                    return self._empty_result()
+
+            valid_types = self._labels_by_supergroup.get(supergroup, [])
+
+            if fields.get("item_type") in valid_types:
+                result = self._format_main_fields(fields)
+            else:
+                # Rare: item_type missing or outside the supergroup → re-prompt with the constrained enum.
+                logging.debug(f"AI CLASSIFICATION: item_type {fields.get('item_type')!r} not in supergroup {supergroup!r}, re-prompting")
+                result = self._classify_main_fields(title, description, valid_types, image_url, model=model)
 
-            result = self._classify_main_fields(title, description, valid_types, image_url)
             result["supergroup_ai_generated"] = supergroup
             return result
 
@@ -53,129 +504,277 @@ class OpenAIManager:
             logging.error(f"AI CLASSIFICATION ERROR: {e}")
             return self._empty_result()
 
-    def _classify_supergroup(self, title, description, image_url):
+    def classify_many(self, items, max_concurrency=20):
+        """
+        Classify many (title, description, image_url) tuples concurrently.
+        The work is network-bound, so threads overlap the OpenAI round-trips.
+        Results are returned in input order.
+        """
+        results = [None] * len(items)
+        if not items:
+            return results
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(items)))) as executor:
+            futures = {
+                executor.submit(self.classify_single_product, *item): idx
+                for idx, item in enumerate(items)
+            }
+            for future in as_completed(futures):
+                idx = futures[future]
+                try:
+                    results[idx] = future.result()
+                except Exception as e:
+                    logging.error(f"AI CLASSIFICATION ERROR: item {idx} failed: {e}")
+                    results[idx] = self._empty_result()
+
+        return results
+
+    def classify_batch(self, items, batch_size=20):
+        """
+        Classify (title, description, image_url) tuples several at a time, sharing one
+        prompt and one request per chunk. Items the model skips or answers with an
+        item_type outside its supergroup fall back to classify_single_product, run
+        concurrently through classify_many.
+        """
+        results = [None] * len(items)
+        fallback = []
+
+        pending = []
+        for idx, item in enumerate(items):
+            advert = self._advertisement_result(item[0])
+            if advert is not None:
+                results[idx] = advert
+                continue
+            cached = self._cache_get(self._classification_key(*item))
+            if cached is not None:
+                results[idx] = dict(cached)
+            else:
+                pending.append(idx)
+
+        for start in range(0, len(pending), batch_size):
+            chunk_indices = pending[start:start + batch_size]
+            chunk = [items[idx] for idx in chunk_indices]
+            parsed = self._classify_chunk(chunk)
+
+            for offset, idx in enumerate(chunk_indices):
+                result = parsed.get(offset)
+                if result is None:
+                    logging.debug(f"AI CLASSIFICATION: batch item {idx} missing or invalid, classifying alone")
+                    fallback.append(idx)
+                    continue
+                if self._is_complete(result):
+                    self._cache_set(self._classification_key(*items[idx]), dict(result))
+                results[idx] = result
+
+        for idx, result in zip(fallback, self.classify_many([items[idx] for idx in fallback])):
+            results[idx] = result
+
+        return results
+
+    def _classify_chunk(self, chunk):
         try:
-            supergroup_data = self.get_supergroup_data()
-            enum_options = [sg["key"] for sg in supergroup_data]
+            self.get_category_data()
+            self.get_supergroup_data()
+
+            tool = self._batch_tool()
+
+            entries = []
+            for idx, item in enumerate(chunk):
+                title, description, *rest = item
+                image_note = f" Image: {rest[0]}" if rest and rest[0] else ""
+                entries.append(f"[{idx}] Title: {title} Description: {description}{image_note}")
 
             messages = [
                 {
                     "role": "system",
-                    "content": """
-                    You are a military historian AI.
-                    Classify each item into one of the following broad supergroups based on its purpose and form.
-                    Return only the enum key that best describes the overall group this item fits into.
-                    """
+                    "content": BATCH_SYSTEM_PROMPT
                 },
                 {
                     "role": "user",
-                    "content": f"""
-                    Title: {title}
-                    Description: {description}
-                    {'Image: ' + image_url if image_url else ''}
-                    """
+                    "content": "\n".join(entries)
                 }
             ]
 
-            tools = [
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "classify_supergroup",
-                        "description": "Classify the item into a supergroup",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "supergroup": {"type": "string", "enum": enum_options}
-                            },
-                            "required": ["supergroup"]
-                        }
+            args = self._stream_tool_call(
+                model=self.model,
+                messages=messages,
+                tools=[tool],
+                tool_choice={"type": "function", "function": {"name": "classify_products"}},
+                temperature=1
+            )
+
+            parsed = {}
+            for entry in args.get("classifications", []):
+                idx = entry.get("index")
+                if not isinstance(idx, int) or not 0 <= idx < len(chunk):
+                    continue
+                if (entry.get("supergroup"), entry.get("item_type")) not in self._valid_pairs:
+                    continue
+                result = self._format_main_fields(entry)
+                if self._is_low_confidence(result):
+                    # Left to classify_single_product, which escalates to the fallback model.
+                    continue
+                result["supergroup_ai_generated"] = entry["supergroup"]
+                parsed[idx] = result
+            return parsed
+
+        except Exception as e:
+            logging.error(f"AI CLASSIFICATION ERROR: batch of {len(chunk)} failed: {e}")
+            return {}
+
+    def _item_schema(self):
+        fields_schema = self._main_fields_tool(self._item_type_union)["function"]["parameters"]
+        return {
+            "type": "object",
+            "properties": {
+                "supergroup": {"type": "string", "enum": self._supergroup_enum, "description": _SUPERGROUP_DESCRIPTION},
+                **fields_schema["properties"]
+            },
+            "required": ["supergroup", *fields_schema["required"]]
+        }
+
+    def _combined_tool(self):
+        key = ("classify_item",)
+        if key not in self._tool_cache:
+            self._tool_cache[key] = {
+                "type": "function",
+                "function": {
+                    "name": "classify_item",
+                    "description": "Classify a militaria item",
+                    "parameters": self._item_schema()
+                }
+            }
+        return self._tool_cache[key]
+
+    def _batch_tool(self):
+        key = ("classify_products",)
+        if key not in self._tool_cache:
+            item_schema = self._item_schema()
+            self._tool_cache[key] = {
+                "type": "function",
+                "function": {
+                    "name": "classify_products",
+                    "description": "Classify each numbered militaria item",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "classifications": {
+                                "type": "array",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "index": {"type": "integer"},
+                                        **item_schema["properties"]
+                                    },
+                                    "required": ["index", *item_schema["required"]]
+                                }
+                            }
+                        },
+                        "required": ["classifications"]
+                    }
+                }
+            }
+        return self._tool_cache[key]
+
+    def _supergroup_tool(self, enum_options):
+        key = ("classify_supergroup", tuple(enum_options))
+        if key not in self._tool_cache:
+            self._tool_cache[key] = {
+                "type": "function",
+                "function": {
+                    "name": "classify_supergroup",
+                    "description": "Classify the item into a supergroup",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "supergroup": {"type": "string", "enum": enum_options, "description": _SUPERGROUP_DESCRIPTION}
+                        },
+                        "required": ["supergroup"]
+                    }
+                }
+            }
+        return self._tool_cache[key]
+
+    def _main_fields_tool(self, item_type_enum):
+        key = ("classify_product", tuple(item_type_enum))
+        if key not in self._tool_cache:
+            self._tool_cache[key] = {
+                "type": "function",
+                "function": {
+                    "name": "classify_product",
+                    "description": "Classify a militaria item",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "conflict": _CONFLICT_SCHEMA,
+                            "nation": _NATION_SCHEMA,
+                            "item_type": {"type": "string", "enum": list(item_type_enum), "description": _ITEM_TYPE_DESCRIPTION}
+                        },
+                        "required": ["conflict", "nation", "item_type"]
                     }
                 }
+            }
+        return self._tool_cache[key]
+
+    def _user_message(self, title, description, image_url=None):
+        image_note = f"\nImage: {image_url}" if image_url else ""
+        return {"role": "user", "content": f"Title: {title}\nDescription: {description}{image_note}"}
+
+    def _format_main_fields(self, result):
+        return {
+            "conflict_ai_generated": result.get("conflict", "").upper(),
+            "nation_ai_generated": result.get("nation", "").upper(),
+            "item_type_ai_generated": result.get("item_type", "").upper()
+        }
+
+    def _classify_supergroup(self, title, description, image_url, model=None):
+        try:
+            self.get_supergroup_data()
+
+            messages = [
+                {
+                    "role": "system",
+                    "content": SUPERGROUP_SYSTEM_PROMPT
+                },
+                self._user_message(title, description, image_url)
             ]
 
-            response = self.client.chat.completions.create(
-                model=self.model,
+            response = self._with_retry(
+                self.client.chat.completions.create,
+                model=model or self.model,
                 messages=messages,
-                tools=tools,
+                tools=[self._supergroup_tool(self._supergroup_enum)],
                 tool_choice="auto",
                 temperature=1
             )
             args = response.choices[0].message.tool_calls[0].function.arguments
-            return json.loads(args).get("supergroup")
+            return orjson.loads(args).get("supergroup")
 
         except Exception as e:
             logging.error(f"Supergroup classification failed: {e}")
             return None
 
-    def _classify_main_fields(self, title, description, item_type_enum, image_url=None):
+    def _classify_main_fields(self, title, description, item_type_enum, image_url=None, model=None):
         try:
-            conflict_enum = [
-                "PRE_19TH", "19TH_CENTURY", "PRE_WW1", "WW1", "PRE_WW2", "WW2",
-                "COLD_WAR", "VIETNAM_WAR", "KOREAN_WAR", "CIVIL_WAR", "MODERN", "UNKNOWN"
-            ]
-
-            nation_enum = [
-                "GERMANY", "UNITED KINGDOM", "USA", "JAPAN", "FRANCE", "CANADA",
-                "AUSTRALIA", "RUSSIA", "ITALY", "NETHERLANDS", "POLAND", "AUSTRIA",
-                "BELGIUM", "CHINA", "VIETNAM", "SOUTH KOREA", "NORTH KOREA", "ISRAEL",
-                "CZECHOSLOVAKIA", "HUNGARY", "SPAIN", "SWEDEN", "FINLAND", "INDIA",
-                "UNKNOWN", "OTHER ALLIED FORCES", "OTHER AXIS FORCES", "OTHER EUROPEAN",
-                "OTHER AMERICAN", "OTHER MIDDLE EAST", "OTHER AFRICAN", "OTHER OCEANIC",
-                "OTHER ASIAN", "OTHER"
-            ]
-
-            tools = [
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "classify_product",
-                        "description": "Classify a militaria item",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "conflict": {"type": "string", "enum": conflict_enum},
-                                "nation": {"type": "string", "enum": nation_enum},
-                                "item_type": {"type": "string", "enum": item_type_enum}
-                            },
-                            "required": ["conflict", "nation", "item_type"]
-                        }
-                    }
-                }
-            ]
-
-            image_note = f"\nImage: {image_url}" if image_url else ""
-
             messages = [
                 {
                     "role": "system",
-                    "content": "You are a military historian AI helping classify collectibles. Use only the provided enums."
+                    "content": MAIN_FIELDS_SYSTEM_PROMPT
                 },
-                {
-                    "role": "user",
-                    "content": f"""
-                        Title: {title}
-                        Description: {description}{image_note}
-                    """
-                }
+                self._user_message(title, description, image_url)
             ]
 
-            response = self.client.chat.completions.create(
-                model=self.model,
+            response = self._with_retry(
+                self.client.chat.completions.create,
+                model=model or self.model,
                 messages=messages,
-                tools=tools,
+                tools=[self._main_fields_tool(item_type_enum)],
                 tool_choice="auto",
                 temperature=1
             )
 
             args = response.choices[0].message.tool_calls[0].function.arguments
-            result = json.loads(args)
-
-            return {
-                "conflict_ai_generated": result.get("conflict", "").upper(),
-                "nation_ai_generated": result.get("nation", "").upper(),
-                "item_type_ai_generated": result.get("item_type", "").upper()
-            }
+            return self._format_main_fields(orjson.loads(args))
 
         except Exception as e:
             logging.error(f"Main field classification failed: {e}")
@@ -194,11 +793,84 @@ class OpenAIManager:
             combined = f"{title or ''} {description or ''}".strip()
             if not combined:
                 return None
-            response = self.client.embeddings.create(
+
+            key = self._cache_key("text-embedding-3-small", combined)
+            cached = self._cache_get(key, embedding=True)
+            if cached is not None:
+                return cached
+
+            response = self._with_retry(
+                self.client.embeddings.create,
                 input=[combined],
                 model="text-embedding-3-small"
             )
-            return response.data[0].embedding
+            embedding = response.data[0].embedding
+            self._cache_set(key, embedding, embedding=True)
+            return embedding
         except Exception as e:
             logging.error(f"OpenAIManager: Failed to generate vector: {e}")
             return None
+
+    def generate_vectors_bulk(self, texts, batch_size=256):
+        """
+        Embed many texts with one request per batch_size inputs.
+        Returns a list aligned with texts; empty or failed entries are None.
+        """
+        vectors = [None] * len(texts)
+
+        pending = []
+        for idx, text in enumerate(texts):
+            text = (text or "").strip()
+            if not text:
+                continue
+            key = self._cache_key("text-embedding-3-small", text)
+            cached = self._cache_get(key, embedding=True)
+            if cached is not None:
+                vectors[idx] = cached
+            else:
+                pending.append((idx, text, key))
+
+        # Written to the cache after the loop: one SQLite commit for the whole call.
+        fresh = []
+        it = iter(pending)
+        while True:
+            chunk = list(islice(it, batch_size))
+            if not chunk:
+                break
+            try:
+                response = self._with_retry(
+                    self.client.embeddings.create,
+                    input=[text for _, text, _ in chunk],
+                    model="text-embedding-3-small"
+                )
+                for data in response.data:
+                    idx, _, key = chunk[data.index]
+                    vectors[idx] = data.embedding
+                    fresh.append((key, data.embedding))
+            except Exception as e:
+                logging.error(f"OpenAIManager: Failed to generate {len(chunk)} vectors: {e}")
+
+        self._cache_set_many(fresh, embedding=True)
+        return vectors
+
+
+_manager_registry = {}
+_registry_lock = threading.Lock()
+
+def get_manager(settings):
+    """
+    Process-wide OpenAIManager keyed on its credential/taxonomy paths and model, so every
+    caller shares one pooled HTTP client. The shared instance is not closed automatically;
+    call close() on it at process exit to release the pool.
+    """
+    key = (
+        settings["openaiCred"],
+        settings["militariaCategories"],
+        settings["supergroupCategories"],
+        settings.get("openaiModel", "gpt-5-mini")
+    )
+    with _registry_lock:
+        manager = _manager_registry.get(key)
+        if manager is None:
+            manager = _manager_registry[key] = OpenAIManager(settings)
+        return manager
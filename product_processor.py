@@ -1,15 +1,94 @@
-import logging, json, pprint, re
+import logging, json, pprint, re, threading, time
+import orjson
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from operator import itemgetter
 
 from exceptiongroup import catch
 from clean_data import CleanData
 import image_extractor
 from datetime import datetime,timezone
 from decimal import Decimal
-from post_processors import normalize_input, apply_post_processors
+from post_processors import normalize_input, apply_post_processors, compile_post_processors
 from typing import Any
 
+_SCHEME_RE = re.compile(r"^https?://", re.IGNORECASE)
+_NON_PRICE_CHARS_RE = re.compile(r"[^\d\.]")
+# Prices that are empty on sight (Decimal("0") hashes equal to 0, so it matches too).
+_EMPTY_PRICES = frozenset((None, 0, 0.0, ""))
+
+# Columns whose queued update value is merged in SQL rather than overwritten.
+_SET_EXPRESSIONS = {
+    "price_history": "price_history = COALESCE(price_history, '[]'::jsonb) || %s::jsonb",
+}
+
+@lru_cache(maxsize=1024)
+def _update_by_id_sql(columns: tuple) -> str:
+    """UPDATE militaria ... WHERE id = %s for an ordered column tuple; built once per shape."""
+    set_clause = ", ".join(_SET_EXPRESSIONS.get(k, f"{k} = %s") for k in columns)
+    return f"UPDATE militaria SET {set_clause} WHERE id = %s"
+
+# extract_data only keeps the first match, so list-returning soup methods are swapped for the
+# single-match equivalent that stops walking the tree at that match.
+_FIRST_MATCH_METHODS = {"select": "select_one", "find_all": "find"}
+
+# DB side of a tile comparison: SELECT url, title, price, available.
+TileRow = namedtuple("TileRow", "url title price available")
+# Tile side of the same comparison, read in one call; raises KeyError if any key is absent.
+_TILE_KEYS = ("url", "title", "price", "available")
+_tile_fields = itemgetter(*_TILE_KEYS)
+
+
+class ComparisonCache:
+    """
+    Process-wide TTL cache of tile comparison rows, keyed by tile URL.
+
+    Sits in front of the tile prefetch query so a product seen again within `ttl`
+    seconds (e.g. shifted onto the next page while a site is being crawled) is not
+    re-read from RDS. Every write path in this module and in AvailabilityTracker
+    invalidates the URLs it touches; changes made by other processes are picked up
+    once the entry expires.
+    """
+    def __init__(self, ttl=300, max_size=50000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._rows = {}
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        entry = self._rows.get(url)
+        if entry is None:
+            return None
+        row, expires = entry
+        if expires < time.monotonic():
+            self._rows.pop(url, None)
+            return None
+        return row
+
+    def put(self, url, row):
+        with self._lock:
+            if len(self._rows) >= self.max_size:
+                self._rows.clear()
+            self._rows[url] = (row, time.monotonic() + self.ttl)
+
+    def invalidate(self, urls):
+        # Tile and DB URLs can differ by a trailing slash; drop both spellings.
+        for url in urls:
+            if not isinstance(url, str):
+                continue
+            url = url.strip()
+            self._rows.pop(url, None)
+            self._rows.pop(url[:-1] if url.endswith("/") else url + "/", None)
+
+
+comparison_cache = ComparisonCache()
+
 # This will handle the dictionary of data extracted from the tile on the products page tile.
 class ProductTileDictProcessor:
+    # Upper bound on URLs sent in one availability UPDATE.
+    AVAILABILITY_BATCH_SIZE = 1000
+
     def __init__(self, site_profile, managers, use_comparison_row=True):
         self.site_profile       = site_profile
         self.use_comparison_list = not use_comparison_row
@@ -19,19 +98,32 @@ class ProductTileDictProcessor:
         self.log_print          = managers.get('logPrint')
         self.use_comparison_row = use_comparison_row
         
-    def product_tile_dict_processor_main(self, tiles: list) -> tuple[list[dict], list[dict]]:
+    def product_tile_dict_processor_main(self, tiles: list) -> tuple[list[dict], list[str]]:
         """
         Decide what to do with each tile:
         • price-only  → batch price update
         • availability-only → batch availability update
         • anything else (incl. title diff) → full detail
-        Returns (processing_required, availability_updates) to preserve old API.
+        Returns (processing_required, availability_urls).
         """
+        # Overlapping pages can repeat a tile; keep the last copy of each URL so it is
+        # compared (and updated) once. Tiles without a usable URL pass through to the sanity check.
+        unique, keyless = {}, []
+        for tile in tiles:
+            url = tile.get("url")
+            if isinstance(url, str) and url.strip():
+                unique[url.strip()] = tile
+            else:
+                keyless.append(tile)
+        if len(unique) + len(keyless) < len(tiles):
+            logging.info(f"PRODUCT PROCESSOR: dropped {len(tiles) - len(unique) - len(keyless)} duplicate tile URLs")
+            tiles = [*unique.values(), *keyless]
+
         try:
-            processing_required, availability_updates, price_updates = self.compare_tile_url_to_rds(tiles)
+            processing_required, availability_urls, availability_flags, price_updates = self.compare_tile_url_to_rds(tiles)
             # counters
             self.counter.add_processing_required_count(len(processing_required))
-            self.counter.add_availability_update_count(len(availability_updates))
+            self.counter.add_availability_update_count(len(availability_urls))
             self.counter.add_price_update_count(len(price_updates))
         except Exception as e:
             logging.error(f"PRODUCT PROCESSOR: compare_tile_url_to_rds failed: {e}")
@@ -39,7 +131,7 @@ class ProductTileDictProcessor:
 
         # Push availability updates first
         try:
-            self.process_availability_update_list(availability_updates)
+            self.process_availability_update_list(availability_urls, availability_flags)
         except Exception as e:
             logging.error(f"PRODUCT PROCESSOR: process_availability_update_list failed: {e}")
 
@@ -49,7 +141,7 @@ class ProductTileDictProcessor:
         except Exception as e:
             logging.error(f"PRODUCT PROCESSOR: process_price_update_list failed: {e}")
 
-        return processing_required, availability_updates
+        return processing_required, availability_urls
 
 
     # If in rds, compare availability status, title, price and update if needed
@@ -57,73 +149,108 @@ class ProductTileDictProcessor:
     def compare_tile_url_to_rds(
         self,
         tiles: list[dict]
-    ) -> tuple[list[dict], list[dict], list[dict]]:
+    ) -> tuple[list[dict], list[str], list[bool], list[dict]]:
         """
-        Returns three lists:
+        Returns four lists:
         - processing_required (full detail)
-        - availability_updates
+        - availability_urls / availability_flags (parallel: flag i belongs to url i)
         - price_updates
         """
         processing_required  = []
-        availability_updates = []
+        availability_urls    = []
+        availability_flags   = []
         price_updates        = []
         cleaner              = CleanData()
+        clean_price          = cleaner.clean_price
+        clean_title          = cleaner.clean_title
+        meaningful_change    = self._meaningful_price_change
+        # The per-tile diff dump is only built when someone is reading DEBUG output.
+        debug_enabled        = logging.getLogger().isEnabledFor(logging.DEBUG)
+
+        # One query for every exact URL on the page, a second for the scheme-insensitive
+        # match of everything the first missed, a third for the site+title fallback of
+        # what is still unmatched. Per-tile lookups only run if one of those failed.
+        known_rows = self._prefetch_db_rows(tiles)
+        loose_rows = self._prefetch_loose_db_rows(
+            [tile for tile in tiles if isinstance(tile.get("url"), str) and tile["url"].strip() not in known_rows]
+        )
+        url_checked = loose_rows is not None
+        known_rows.update(loose_rows or {})
+        all_checked = False
+        if url_checked:
+            title_rows = self._prefetch_title_rows(
+                [tile for tile in tiles if isinstance(tile.get("url"), str) and tile["url"].strip() not in known_rows]
+            )
+            all_checked = title_rows is not None
+            known_rows.update(title_rows or {})
+        known_get  = known_rows.get
+        find_row   = self.find_existing_db_row
+        site_profile, rds_manager = self.site_profile, self.rds_manager
+        require_detail = processing_required.append
 
         for tile in tiles:
-            url       = tile.get("url")
-            title     = tile.get("title")
-            raw_price = tile.get("price")
-            available = tile.get("available")
+            try:
+                url, title, raw_price, available = _tile_fields(tile)
+            except KeyError:
+                url, title, raw_price, available = map(tile.get, _TILE_KEYS)
 
             # --- Sanity ---------------------------------------------------------
             if url is None or title is None or available is None:
                 logging.error(f"TILE DEDUP: missing url/title/available, skipping → {tile}")
                 continue
 
-            db_row = self.find_existing_db_row(tile, self.site_profile, self.rds_manager)
+            url_key = url.strip() if isinstance(url, str) else url
+            db_row = known_get(url_key)
+            if db_row is None and not all_checked:
+                db_row = find_row(tile, site_profile, rds_manager, url_checked=url_checked)
             if not db_row:
-                logging.info(f"NEW PRODUCT → full detail → {url}")
-                processing_required.append(tile)
+                logging.info("NEW PRODUCT → full detail → %s", url)
+                require_detail(tile)
                 continue
 
-            db_url, db_title, db_price, db_available = db_row
-
             # --- Clean inputs ---------------------------------------------------
             try:
-                tile_price_clean = cleaner.clean_price(str(raw_price)) if raw_price is not None else None
+                tile_price_clean = clean_price(str(raw_price)) if raw_price is not None else None
             except Exception:
                 tile_price_clean = None
 
             try:
-                tile_title_clean = cleaner.clean_title(title)
+                tile_title_clean = clean_title(title)
             except Exception:
                 tile_title_clean = title
 
             # --- Diff flags -----------------------------------------------------
-            avail_changed = bool(available) != bool(db_available)
-            title_changed = tile_title_clean != db_title
-            price_changed = self._meaningful_price_change(db_price, tile_price_clean)
+            # Most tiles on a re-crawl are unchanged: one tuple compare settles them
+            # before the per-field flags and the price-change rules are evaluated.
+            if (tile_title_clean, tile_price_clean, bool(available)) == (db_row.title, db_row.price, bool(db_row.available)):
+                logging.debug("TILE COMPARE: url=%r NO CHANGE → skipping", url)
+                continue
+
+            avail_changed = bool(available) != bool(db_row.available)
+            title_changed = tile_title_clean != db_row.title
+            price_changed = meaningful_change(db_row.price, tile_price_clean)
 
             # --- Debug logging --------------------------------------------------
-            if title_changed or price_changed or avail_changed:
-                logging.debug("------------------------------------------------")
-                logging.debug(f"TILE COMPARE: url={url!r}")
-                if title_changed:
-                    logging.debug("↪️ TITLE CHANGED:")
-                    logging.debug(f"  INCOMING: {tile_title_clean}")
-                    logging.debug(f"  DB      : {db_title}")
-                if price_changed:
-                    logging.debug("↪️ PRICE CHANGED:")
-                    logging.debug(f"  INCOMING: {tile_price_clean}")
-                    logging.debug(f"  DB      : {db_price}")
-                if avail_changed:
-                    logging.debug("↪️ AVAILABILITY CHANGED:")
-                    logging.debug(f"  INCOMING: {available}")
-                    logging.debug(f"  DB      : {db_available}")
-            else:
-                logging.debug("------------------------------------------------")
-                logging.debug(f"TILE COMPARE: url={url!r}, title_changed=False, price_changed=False, avail_changed=False")
-                logging.debug("NO CHANGE → skipping")
+            if debug_enabled:
+                if title_changed or price_changed or avail_changed:
+                    logging.debug("------------------------------------------------")
+                    logging.debug(f"TILE COMPARE: url={url!r}")
+                    if title_changed:
+                        logging.debug("↪️ TITLE CHANGED:")
+                        logging.debug(f"  INCOMING: {tile_title_clean}")
+                        logging.debug(f"  DB      : {db_row.title}")
+                    if price_changed:
+                        logging.debug("↪️ PRICE CHANGED:")
+                        logging.debug(f"  INCOMING: {tile_price_clean}")
+                        logging.debug(f"  DB      : {db_row.price}")
+                    if avail_changed:
+                        logging.debug("↪️ AVAILABILITY CHANGED:")
+                        logging.debug(f"  INCOMING: {available}")
+                        logging.debug(f"  DB      : {db_row.available}")
+                else:
+                    logging.debug("------------------------------------------------")
+                    logging.debug(f"TILE COMPARE: url={url!r}, title_changed=False, price_changed=False, avail_changed=False")
+                    logging.debug("NO CHANGE → skipping")
 
             # --- Routing --------------------------------------------------------
             if not (title_changed or price_changed or avail_changed):
@@ -132,36 +259,37 @@ class ProductTileDictProcessor:
             # 1) price‑only
             if price_changed and not title_changed and not avail_changed:
                 if (
-                    isinstance(db_price, (int, float)) and
+                    isinstance(db_row.price, (int, float)) and
                     isinstance(tile_price_clean, (int, float)) and
-                    self._meaningful_price_change(db_price, tile_price_clean)
+                    meaningful_change(db_row.price, tile_price_clean)
                 ):
                     price_updates.append({
-                        "url": db_url,
-                        "old": float(db_price),
+                        "url": db_row.url,
+                        "old": float(db_row.price),
                         "new": float(tile_price_clean),
                     })
                 else:
                     logging.debug(
-                        f"PRICE GUARD: ignoring price diff for {url} "
-                        f"(old={db_price}, new={tile_price_clean})"
+                        "PRICE GUARD: ignoring price diff for %s (old=%s, new=%s)",
+                        url, db_row.price, tile_price_clean
                     )
                 continue
 
             # 2) availability‑only
             if avail_changed and not title_changed and not price_changed:
-                logging.info(f"AVAILABILITY CHANGE → {url} (to available={available})")
-                availability_updates.append({"url": db_url, "available": bool(available)})
+                logging.info("AVAILABILITY CHANGE → %s (to available=%s)", url, available)
+                availability_urls.append(db_row.url)
+                availability_flags.append(bool(available))
                 continue
 
             # 3) anything else → full detail
             logging.info(
-                f"REQUIRE FULL DETAIL → {url} "
-                f"(title_changed={title_changed}, price_changed={price_changed}, avail_changed={avail_changed})"
+                "REQUIRE FULL DETAIL → %s (title_changed=%s, price_changed=%s, avail_changed=%s)",
+                url, title_changed, price_changed, avail_changed
             )
-            processing_required.append(tile)
+            require_detail(tile)
 
-        return processing_required, availability_updates, price_updates
+        return processing_required, availability_urls, availability_flags, price_updates
 
 
     def process_price_update_list(self, updates: list[dict]) -> None:
@@ -175,7 +303,16 @@ class ProductTileDictProcessor:
             return
 
         now = datetime.now(timezone.utc).isoformat()
+        query = """
+            UPDATE militaria
+            SET price = %s,
+                price_history = coalesce(price_history, '[]'::jsonb) || %s::jsonb,
+                date_modified = %s,
+                last_seen = %s
+            WHERE url = %s;
+        """
 
+        params_list = []
         for upd in updates:
             url = upd.get("url")
             old = upd.get("old")
@@ -191,31 +328,19 @@ class ProductTileDictProcessor:
                 continue
 
             try:
-                history_json = json.dumps([{"price": float(old), "date": now}])
-                query = """
-                    UPDATE militaria
-                    SET price = %s,
-                        price_history = coalesce(price_history, '[]'::jsonb) || %s::jsonb,
-                        date_modified = %s,
-                        last_seen = %s
-                    WHERE url = %s;
-                """
-                params = (float(new), history_json, now, now, url)
-
-                # If update_record doesn't return rowcount, fall back to execute and assume success.
-                try:
-                    rows_updated = self.rds_manager.update_record(query, params)
-                except TypeError:
-                    # old signature
-                    self.rds_manager.update_record(query, params)
-                    rows_updated = 1
-
-                if rows_updated:
-                    logging.info(f"PRICE UPDATE: {url} → {old} ⇒ {new}")
-                else:
-                    logging.warning(f"PRICE UPDATE: no rows updated for {url}")
-            except Exception as e:
+                history_json = orjson.dumps([{"price": float(old), "date": now}]).decode("utf-8")
+                params_list.append((float(new), history_json, now, now, url))
+            except (TypeError, ValueError) as e:
                 logging.error(f"PRICE UPDATE: failed for {url}: {e}")
+                continue
+            comparison_cache.invalidate((url,))
+            logging.info(f"PRICE UPDATE: {url} → {old} ⇒ {new}")
+
+        # Same statement for every row: one connection/cursor, statements sent in pages.
+        try:
+            self.rds_manager.execute_batch(query, params_list)
+        except Exception as e:
+            logging.error(f"PRICE UPDATE: batch of {len(params_list)} updates failed: {e}")
 
 
 
@@ -229,15 +354,18 @@ class ProductTileDictProcessor:
         - Strings with currency symbols (e.g. "$0.00", "€0")
         - Any numeric type (int, float, Decimal) equal to zero
         """
-        if value is None:
-            return True
+        try:
+            if value in _EMPTY_PRICES:
+                return True
+        except TypeError:  # unhashable input; let the string path decide
+            pass
 
         text = str(value).strip()
         if not text:
             return True
 
         # Drop everything except digits and dot
-        cleaned = re.sub(r"[^\d\.]", "", text)
+        cleaned = _NON_PRICE_CHARS_RE.sub("", text)
         if not cleaned:
             # e.g. original value was "$" or "—"
             return True
@@ -248,56 +376,188 @@ class ProductTileDictProcessor:
             return False
 
 
-    def process_availability_update_list(self, updates: list[dict]) -> None:
+    def process_availability_update_list(self, urls: list[str], flags: list[bool]) -> None:
         """
-        Batch‑update availability flags and timestamps for each product in `updates`.
-        Each dict must include 'url' (str) and 'available' (bool).
+        Batch‑update availability flags and timestamps for each product in `urls`.
+        `flags` is parallel to `urls`: flags[i] is the new 'available' value for urls[i].
         """
-        if not updates:
+        if not urls:
             return
 
         now = datetime.now(timezone.utc).isoformat()
         sold_query = (
             "UPDATE militaria "
-            "SET available = %s, date_sold = %s, date_modified = %s, last_seen = %s "
-            "WHERE url = %s;"
+            "SET available = FALSE, date_sold = %s, date_modified = %s, last_seen = %s "
+            "WHERE url = ANY(%s);"
         )
         avail_query = (
             "UPDATE militaria "
-            "SET available = %s, date_sold = NULL, date_modified = %s, last_seen = %s "
-            "WHERE url = %s;"
+            "SET available = TRUE, date_sold = NULL, date_modified = %s, last_seen = %s "
+            "WHERE url = ANY(%s);"
         )
 
-        for item in updates:
-            url = item.get("url")
+        # Every row in a group gets the same values, so each group is one UPDATE ... ANY(%s)
+        # per chunk instead of one round-trip per product.
+        available_urls, sold_urls = [], []
+        for url, available in zip(urls, flags):
             if not url:
                 logging.error("PRODUCT PROCESSOR: Missing 'url' in availability update item, skipping.")
                 continue
+            (available_urls if available else sold_urls).append(url)
+        comparison_cache.invalidate(available_urls + sold_urls)
+
+        for urls, query, params, available in (
+            (available_urls, avail_query, (now, now), True),
+            (sold_urls, sold_query, (now, now, now), False),
+        ):
+            for start in range(0, len(urls), self.AVAILABILITY_BATCH_SIZE):
+                chunk = urls[start:start + self.AVAILABILITY_BATCH_SIZE]
+                try:
+                    self.rds_manager.update_record(query, params + (chunk,))
+                    logging.info(f"PRODUCT PROCESSOR: Updated availability for {len(chunk)} products → available={available}")
+                except Exception as e:
+                    logging.error(f"PRODUCT PROCESSOR: Failed to update availability for {len(chunk)} products (available={available}): {e}")
 
-            available = bool(item.get("available"))
+    def _prefetch_db_rows(self, tiles: list[dict]) -> dict:
+        """
+        Fetch DB rows for every tile URL (and its slash variant) in a single query.
+        Returns {tile_url: TileRow} keyed by the tile's own URL,
+        so the compare loop can resolve exact matches with one dict lookup.
+        URLs still fresh in comparison_cache are answered without touching RDS.
+        """
+        known = {}
+        variants = {}
+        for tile in tiles:
+            raw = tile.get("url")
+            if not isinstance(raw, str) or not raw.strip():
+                continue
+            url = raw.strip()
+            cached = comparison_cache.get(url)
+            if cached is not None:
+                known[url] = cached
+                continue
+            variants[url] = url
+            variants.setdefault(url[:-1] if url.endswith("/") else url + "/", url)
+
+        if not variants:
+            return known
+
+        try:
+            rows = self.rds_manager.fetch(
+                "SELECT url, title, price, available FROM militaria WHERE url = ANY(%s)",
+                (list(variants),)
+            )
+        except Exception as e:
+            logging.error(f"TILE DEDUP: bulk URL prefetch failed, falling back to per-tile lookups: {e}")
+            return known
+
+        for row in rows or []:
+            tile_url = variants.get(row[0])
+            if tile_url is not None and (tile_url not in known or row[0] == tile_url):
+                known[tile_url] = TileRow._make(row)
+        for tile_url in frozenset(variants.values()):
+            if tile_url in known:
+                comparison_cache.put(tile_url, known[tile_url])
+        return known
+
+    def _prefetch_loose_db_rows(self, tiles: list[dict]) -> dict:
+        """
+        Scheme-insensitive, slash-insensitive URL match for many tiles in one query:
+        the same rule as step 1 of find_existing_db_row, but one table pass for the
+        whole set of misses instead of one per tile. Returns {tile_url: TileRow},
+        or None if the query failed and the per-tile lookup has to run instead.
+        """
+        stripped_to_tile = {}
+        for tile in tiles:
+            raw = tile.get("url")
             try:
-                if available:
-                    params = (True, now, now, url)
-                    query = avail_query
-                else:
-                    params = (False, now, now, now, url)
-                    query = sold_query
+                clean_url = CleanData.clean_url(raw)
+            except ValueError:
+                continue
+            alt_url = clean_url[:-1] if clean_url.endswith("/") else clean_url + "/"
+            for variant in (clean_url, alt_url):
+                stripped_to_tile.setdefault(_SCHEME_RE.sub("", variant), raw.strip())
 
-                self.rds_manager.update_record(query, params)
-                logging.info(f"PRODUCT PROCESSOR: Updated availability for {url} → available={available}")
-            except Exception as e:
-                logging.error(f"PRODUCT PROCESSOR: Failed to update availability for {url}: {e}")
+        if not stripped_to_tile:
+            return {}
+
+        try:
+            rows = self.rds_manager.fetch(
+                """
+                SELECT url, title, price, available
+                FROM militaria
+                WHERE REPLACE(REPLACE(url,'http://',''),'https://','') = ANY(%s)
+                """,
+                (list(stripped_to_tile),)
+            )
+        except Exception as e:
+            logging.error(f"TILE DEDUP: bulk loose-URL prefetch failed, falling back to per-tile lookups: {e}")
+            return None
+
+        found = {}
+        for row in rows or []:
+            tile_url = stripped_to_tile.get(row[0].replace("http://", "").replace("https://", ""))
+            if tile_url is not None and tile_url not in found:
+                found[tile_url] = TileRow._make(row)
+        return found
+
+    def _prefetch_title_rows(self, tiles: list[dict]) -> dict:
+        """
+        site + title fallback for many tiles in one query: step 2 of find_existing_db_row
+        (newest row per title wins) for every tile no URL match found. On a fresh site
+        most tiles land here, so this replaces one round-trip per new product.
+        Returns {tile_url: TileRow}, or None if the query failed.
+        """
+        site = self.site_profile.get("source_name")
+        title_to_tiles = {}
+        for tile in tiles:
+            url, title = tile.get("url"), tile.get("title")
+            if not isinstance(url, str) or not isinstance(title, str):
+                continue
+            try:
+                CleanData.clean_url(url)  # find_existing_db_row gives up on unusable URLs too
+            except ValueError:
+                continue
+            clean_title = CleanData.clean_title(title)
+            if clean_title:
+                title_to_tiles.setdefault(clean_title, []).append(url.strip())
+
+        if not site or not title_to_tiles:
+            return {}
+
+        try:
+            rows = self.rds_manager.fetch(
+                """
+                SELECT DISTINCT ON (title) url, title, price, available
+                FROM militaria
+                WHERE site = %s
+                AND title = ANY(%s)
+                ORDER BY title, COALESCE(date_modified, last_seen, date_sold) DESC
+                """,
+                (site, list(title_to_tiles))
+            )
+        except Exception as e:
+            logging.error(f"TILE DEDUP: bulk site+title prefetch failed, falling back to per-tile lookups: {e}")
+            return None
+
+        found = {}
+        for row in rows or []:
+            for tile_url in title_to_tiles.get(row[1], ()):
+                found.setdefault(tile_url, TileRow._make(row))
+        return found
 
     def find_existing_db_row(
         self,
         product: dict,
         site_profile: dict,
-        rds_manager
-    ) -> tuple[str, str, float, bool] | None:
+        rds_manager,
+        url_checked: bool = False
+    ) -> TileRow | None:
         """
         Tile‑level dedup:
         1. Exact URL match (with/without trailing slash, scheme‑insensitive)
         2. site + title fallback
+        url_checked=True skips step 1 when the caller's bulk prefetch already ran it.
         """
         raw = product.get("url") or ""
         try:
@@ -312,27 +572,28 @@ class ProductTileDictProcessor:
             alt_url = clean_url + "/"
 
         # Strip scheme for matching
-        strip1 = re.sub(r"^https?://", "", clean_url, flags=re.IGNORECASE)
-        strip2 = re.sub(r"^https?://", "", alt_url,   flags=re.IGNORECASE)
+        strip1 = _SCHEME_RE.sub("", clean_url)
+        strip2 = _SCHEME_RE.sub("", alt_url)
 
         # 1) Exact URL match (either variant, either scheme)
-        try:
-            rows = rds_manager.fetch(
-                """
-                SELECT url, title, price, available
-                FROM militaria
-                WHERE url = %s
-                    OR url = %s
-                    OR REPLACE(REPLACE(url,'http://',''),'https://','') = %s
-                    OR REPLACE(REPLACE(url,'http://',''),'https://','') = %s
-                LIMIT 1
-                """,
-                (clean_url, alt_url, strip1, strip2)
-            )
-            if rows:
-                return rows[0]
-        except Exception as e:
-            logging.error(f"TILE DEDUP: exact-URL lookup failed for {raw!r}: {e}")
+        if not url_checked:
+            try:
+                rows = rds_manager.fetch(
+                    """
+                    SELECT url, title, price, available
+                    FROM militaria
+                    WHERE url = %s
+                        OR url = %s
+                        OR REPLACE(REPLACE(url,'http://',''),'https://','') = %s
+                        OR REPLACE(REPLACE(url,'http://',''),'https://','') = %s
+                    LIMIT 1
+                    """,
+                    (clean_url, alt_url, strip1, strip2)
+                )
+                if rows:
+                    return TileRow._make(rows[0])
+            except Exception as e:
+                logging.error(f"TILE DEDUP: exact-URL lookup failed for {raw!r}: {e}")
 
         # 2) site + title fallback
         site = site_profile.get("source_name")
@@ -352,7 +613,7 @@ class ProductTileDictProcessor:
                     (site, clean_title)
                 )
                 if rows:
-                    return rows[0]
+                    return TileRow._make(rows[0])
             except Exception as e:
                 logging.error(f"TILE DEDUP: site+title lookup failed for {site!r}, {title!r}: {e}")
 
@@ -397,6 +658,31 @@ class ProductTileDictProcessor:
 
 
 class ProductDetailsProcessor:
+    # Concurrent detail-page workers; kept below AwsRdsManager's max_connections.
+    DETAIL_WORKERS = 4
+    # Queued old-product UPDATEs sent per round-trip by flush_pending_updates.
+    UPDATE_PAGE_SIZE = 500
+    # construct_details_data's fields: (data key, selector key, extractor method, value when
+    # the selector is absent). `list` stands for a fresh empty list. "price" also needs the URL.
+    DETAIL_FIELDS = (
+        ("title",                      "details_title",           "extract_details_title",           None),
+        ("description",                "details_description",     "extract_details_description",     None),
+        ("price",                      "details_price",           "extract_details_price",           "0"),
+        ("available",                  "details_availability",    "extract_details_availability",    None),
+        ("original_image_urls",        "details_image_url",       "extract_details_image_url",       list),
+        ("nation_site_designated",     "details_nation",          "extract_details_nation",          None),
+        ("conflict_site_designated",   "details_conflict",        "extract_details_conflict",        None),
+        ("item_type_site_designated",  "details_item_type",       "extract_details_item_type",       None),
+        ("extracted_id",               "details_extracted_id",    "extract_details_extracted_id",    None),
+        ("grade",                      "details_grade",           "extract_details_grade",           None),
+        ("categories_site_designated", "details_site_categories", "extract_details_site_categories", list),
+    )
+    # Site-designated metadata copied onto existing products when present.
+    METADATA_FIELDS = (
+        "nation_site_designated", "conflict_site_designated",
+        "item_type_site_designated", "grade", "categories_site_designated"
+    )
+
     def __init__(self, site_profile, managers, use_comparison_row=True):
         self.site_profile       = site_profile
         self.managers           = managers
@@ -406,6 +692,80 @@ class ProductDetailsProcessor:
         self.html_manager       = managers.get('html_manager')
         self.details_selectors  = site_profile.get("product_details_selectors", {})
         self.use_comparison_row = use_comparison_row
+        # BeautifulSoup tree builder for detail pages. A site can opt into "lxml" (libxml2, much
+        # faster to build) via access_config.details_parser once its selectors are checked against it.
+        self.details_parser     = site_profile.get("access_config", {}).get("details_parser", "html.parser")
+        # Optional access_config.details_parse_only: tag names the detail selectors live under.
+        # Only those subtrees are built; selectors that walk outside them will stop matching.
+        self.details_strainer   = self._build_details_strainer()
+        # Old-product UPDATEs queued by changed-column set; flushed at the end of a run.
+        self._pending_updates   = {}
+        self._pending_lock      = threading.Lock()
+        # Held from the existing-row lookup through the INSERT, so two workers whose pages
+        # resolve to the same product cannot both miss the lookup and insert it twice.
+        self._upsert_lock       = threading.Lock()
+        # parse_details_config results; the selectors are fixed for the processor's site.
+        self._details_config_cache = {}
+
+        # DETAIL_FIELDS split once per site: fields with a selector get their bound extractor,
+        # fields without one just take their default and are never dispatched per product.
+        self._detail_extractors = tuple(
+            (key, getattr(self, method))
+            for key, selector_key, method, default in self.DETAIL_FIELDS
+            if self.details_selectors.get(selector_key)
+        )
+        self._detail_defaults = tuple(
+            (key, default)
+            for key, selector_key, method, default in self.DETAIL_FIELDS
+            if not self.details_selectors.get(selector_key)
+        )
+
+        # details_price post_process compiled once per site; each product's soup/url is passed as context.
+        price_config = self.details_selectors.get("details_price")
+        self._price_post_process = (
+            compile_post_processors(price_config["post_process"])
+            if isinstance(price_config, dict) and price_config.get("post_process") else None
+        )
+
+        # Image extractor named by details_image_url.function, resolved once per site.
+        self._image_extractor_name, self._image_extractor = self._resolve_image_extractor()
+
+        # Site/currency stamped on every cleaned product; fixed for the processor's site.
+        self._site_name = site_profile.get('source_name', 'unknown')
+        self._currency  = site_profile.get("access_config", {}).get("currency_code", "usd")
+
+        # (key, cleaning function) pairs (built once, walked in order for every product)
+        clean_data = CleanData()
+        self._cleaning_pairs = (
+            ("url"                       , clean_data.clean_url),
+            ("title"                     , lambda v: clean_data.clean_title(v, allow_empty=True)),
+            ("description"               , lambda v: clean_data.clean_description(v, allow_empty=True)),
+            ("price"                     , clean_data.clean_price),
+            ("available"                 , clean_data.clean_available),
+            ("original_image_urls"       , clean_data.clean_url_list),
+            ("nation_site_designated"    , clean_data.clean_nation),
+            ("conflict_site_designated"  , clean_data.clean_conflict),
+            ("item_type_site_designated" , clean_data.clean_item_type),
+            ("extracted_id"              , clean_data.clean_extracted_id),
+            ("grade"                     , clean_data.clean_grade),
+            ("categories_site_designated", clean_data.clean_categories),
+        )
+
+    def _build_details_strainer(self):
+        """
+        SoupStrainer for access_config.details_parse_only, or None (full parse) when unset or invalid.
+        """
+        tags = self.site_profile.get("access_config", {}).get("details_parse_only")
+        if not tags:
+            return None
+        if isinstance(tags, str):
+            tags = [tags]
+        try:
+            from bs4 import SoupStrainer
+            return SoupStrainer(list(tags))
+        except Exception as e:
+            logging.error(f"DETAIL PROCESSOR: Invalid details_parse_only {tags!r}, parsing full pages: {e}")
+            return None
 
     def product_details_processor_main(self, processing_required: list[dict]) -> None:
         """
@@ -417,174 +777,242 @@ class ProductDetailsProcessor:
         if count == 0:
             return
 
-        for prod in processing_required:
-            url = prod.get("url")
-            logging.info(f"\n****************** Processing details for {url} ******************")
+        # Each product is a detail-page fetch plus a few DB round-trips, so the pages
+        # are worked through concurrently; the pool stays below the DB connection pool.
+        # One timestamp for the whole batch; its updates are flushed together anyway.
+        now = datetime.now(timezone.utc).isoformat()
+        workers = min(self.DETAIL_WORKERS, count)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self._process_product_details, prod, now): prod for prod in processing_required}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    logging.error(f"DETAIL PROCESSOR: Unexpected error for {futures[future].get('url')}: {e}")
+
+        self.flush_pending_updates()
+        logging.info("DETAIL PROCESSOR: Finished processing all products")
 
-            # ------------------ STEP 1: DB snapshot ------------------
-            try:
-                result = self.rds_manager.fetch(
-                    """
-                    SELECT id, title, description, price, available, original_image_urls
-                    FROM militaria
-                    WHERE url = %s
-                    LIMIT 1
-                    """,
-                    (url,)
-                )
-                db_present = bool(result)
-                if db_present:
-                    (db_id, db_title, db_description, db_price,
-                    db_available, db_image_urls) = result[0]
-                else:
-                    db_id = db_title = db_description = db_price = db_available = db_image_urls = None
-            except Exception as e:
-                logging.error(f"DETAIL PROCESSOR: DB lookup failed for {url}: {e}")
-                db_present = False
-                db_title = db_description = db_price = db_available = db_image_urls = None
+    def _process_product_details(self, prod: dict, now: str) -> None:
+        """
+        Full details refresh for one product: DB snapshot, page fetch, extract/clean, then upsert.
+        """
+        url = prod.get("url")
+        logging.info("\n****************** Processing details for %s ******************", url)
+        # Whatever happens below may rewrite this product's row.
+        comparison_cache.invalidate((url,))
 
-            # ------------------ STEP 2: Normalize TILE fields ------------------
-            try:
-                new_title = CleanData.clean_title(prod.get("title", ""), allow_empty=True)
-                if not new_title:
-                    new_title = CleanData.clean_title(db_title or "", allow_empty=True)
-            except Exception as e:
-                logging.error(f"DETAIL PROCESSOR: title clean error for {url}: {e}")
-                new_title = db_title or ""
+        # ------------------ STEP 1: DB snapshot ------------------
+        try:
+            result = self.rds_manager.fetch(
+                """
+                SELECT id, title, description, price, available, original_image_urls
+                FROM militaria
+                WHERE url = %s
+                LIMIT 1
+                """,
+                (url,)
+            )
+            db_present = bool(result)
+            if db_present:
+                (db_id, db_title, db_description, db_price,
+                db_available, db_image_urls) = result[0]
+            else:
+                db_id = db_title = db_description = db_price = db_available = db_image_urls = None
+        except Exception as e:
+            logging.error(f"DETAIL PROCESSOR: DB lookup failed for {url}: {e}")
+            db_present = False
+            db_title = db_description = db_price = db_available = db_image_urls = None
 
-            try:
-                new_price = CleanData.clean_price(str(prod.get("price", "")))
-            except Exception:
-                new_price = None
+        # ------------------ STEP 2: Normalize TILE fields ------------------
+        try:
+            new_title = CleanData.clean_title(prod.get("title", ""), allow_empty=True)
+            if not new_title:
+                new_title = CleanData.clean_title(db_title or "", allow_empty=True)
+        except Exception as e:
+            logging.error(f"DETAIL PROCESSOR: title clean error for {url}: {e}")
+            new_title = db_title or ""
 
-            tile_available = bool(prod.get("available", True))
+        try:
+            new_price = CleanData.clean_price(str(prod.get("price", "")))
+        except Exception:
+            new_price = None
 
-            # ------------------ STEP 3: Normalize DB fields ------------------
-            db_title_clean = CleanData.clean_title(db_title or "", allow_empty=True)
-            db_description_clean = CleanData.clean_description(db_description or "", allow_empty=True)
-            try:
-                db_price_float = float(db_price)
-            except Exception:
-                db_price_float = None
+        tile_available = bool(prod.get("available", True))
+
+        # ------------------ STEP 3: Normalize DB fields ------------------
+        db_title_clean = CleanData.clean_title(db_title or "", allow_empty=True)
+        db_description_clean = CleanData.clean_description(db_description or "", allow_empty=True)
+        try:
+            db_price_float = float(db_price)
+        except Exception:
+            db_price_float = None
 
-            # ------------------ STEP 4: Quick diff ------------------
-            title_changed = new_title != db_title_clean
-            price_changed = self._meaningful_price_change(db_price_float, new_price)
-            avail_changed = (tile_available != (db_available if db_available is not None else True))
+        # ------------------ STEP 4: Quick diff ------------------
+        title_changed = new_title != db_title_clean
+        price_changed = self._meaningful_price_change(db_price_float, new_price)
+        avail_changed = (tile_available != (db_available if db_available is not None else True))
 
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
             logging.debug("DETAIL COMPARE (tile vs DB):")
             if title_changed:
-                logging.debug(f"→ TITLE CHANGED:\nDB   : {db_title_clean}\nNEW  : {new_title}")
+                logging.debug("→ TITLE CHANGED:\nDB   : %s\nNEW  : %s", db_title_clean, new_title)
             if price_changed:
-                logging.debug(f"→ PRICE CHANGED:\nDB   : {db_price_float}\nNEW  : {new_price}")
+                logging.debug("→ PRICE CHANGED:\nDB   : %s\nNEW  : %s", db_price_float, new_price)
             if avail_changed:
-                logging.debug(f"→ AVAIL CHANGED:\nDB   : {db_available}\nNEW  : {tile_available}")
+                logging.debug("→ AVAIL CHANGED:\nDB   : %s\nNEW  : %s", db_available, tile_available)
 
-            # ------------------ STEP 5: Fetch & parse HTML ------------------
-            try:
-                soup = self.html_manager.parse_html(url)
-            except Exception as e:
-                logging.error(f"DETAIL PROCESSOR: HTML parse failed for {url}: {e}")
-                continue
+        # ------------------ STEP 5: Fetch & parse HTML ------------------
+        try:
+            soup = self.html_manager.parse_html(url, parser=self.details_parser, parse_only=self.details_strainer)
+        except Exception as e:
+            logging.error(f"DETAIL PROCESSOR: HTML parse failed for {url}: {e}")
+            return
 
-            # ------------------ STEP 6: Extract & clean ------------------
-            try:
-                raw_details = self.construct_details_data(url, soup)
-                clean_details = self.construct_clean_details_data(raw_details)
+        # ------------------ STEP 6: Extract & clean ------------------
+        try:
+            clean_details = self.construct_clean_details_data(self.construct_details_data(url, soup))
 
-                if not clean_details.get("title"):
-                    logging.debug("DETAIL FALLBACK: empty detail title → using tile/DB title")
-                    clean_details["title"] = new_title or db_title_clean
+            if not clean_details.get("title"):
+                logging.debug("DETAIL FALLBACK: empty detail title → using tile/DB title")
+                clean_details["title"] = new_title or db_title_clean
 
-                if not clean_details.get("description"):
-                    logging.debug("DETAIL FALLBACK: empty detail description → using DB or placeholder")
-                    clean_details["description"] = db_description_clean or "No description available."
+            if not clean_details.get("description"):
+                logging.debug("DETAIL FALLBACK: empty detail description → using DB or placeholder")
+                clean_details["description"] = db_description_clean or "No description available."
 
-            except Exception as e:
-                logging.error(f"DETAIL PROCESSOR: Data extraction/cleaning failed for {url}: {e}")
-                continue
+        except Exception as e:
+            logging.error(f"DETAIL PROCESSOR: Data extraction/cleaning failed for {url}: {e}")
+            return
 
-            # ------------------ STEP 7: Dedup & upsert ------------------
-            try:
+        # ------------------ STEP 7: Dedup & upsert ------------------
+        try:
+            incoming_url = clean_details.get("url")
+            new_id = None
+            with self._upsert_lock:
                 matched_id, matched_url = find_existing_db_row_details(
                     clean_details, self.site_profile, self.rds_manager
                 )
-                incoming_url = clean_details.get("url")
-
-                if matched_id:
-                    if matched_url != incoming_url:
-                        logging.info(f"DETAIL PROCESSOR: Replacing old DB URL with new one → {matched_url} → {incoming_url}")
-                        try:
-                            self.rds_manager.update_record(
-                                "UPDATE militaria SET url = %s, date_modified = %s WHERE id = %s;",
-                                (incoming_url, datetime.now(timezone.utc).isoformat(), matched_id)
-                            )
-                            logging.info(f"DETAIL PROCESSOR: DB URL updated for id={matched_id}")
-                        except Exception as e:
-                            logging.error(f"DETAIL PROCESSOR: Failed to update URL for id={matched_id}: {e}")
-
-                    clean_details['url'] = incoming_url
-                    old_price = db_price_float
-                    new_price = clean_details.get("price")
-                    is_sold = clean_details.get("available") is False
-
-                    if is_sold and not self._meaningful_price_change(old_price, new_price):
-                        logging.info(f"DETAIL PROCESSOR: Skipping unchanged sold item: {incoming_url}")
-                        self.counter.add_skipped_sold_item()
-                        continue
-
-                    logging.info(f"DETAIL PROCESSOR: Found existing record (id={matched_id}) for {incoming_url}")
-                    self.counter.add_old_product_count()
-                    did_update = self.old_product_processor(clean_details, matched_id)
-                    if did_update:
-                        logging.info(f"DETAIL PROCESSOR: Updated old product id={matched_id}")
-                    else:
-                        logging.info(f"DETAIL PROCESSOR: No detail changes for id={matched_id}")
-
-                else:
-                    logging.info(f"DETAIL PROCESSOR: New product detected for {incoming_url}")
-                    self.counter.add_new_product_count()
+                if not matched_id:
+                    new_id = self._insert_new_product(clean_details)
+                elif matched_url != incoming_url:
+                    logging.info(f"DETAIL PROCESSOR: Replacing old DB URL with new one → {matched_url} → {incoming_url}")
+                    comparison_cache.invalidate((matched_url, incoming_url))
                     try:
-                        self.new_product_processor(clean_details, raw_details)
-                        logging.info(f"DETAIL PROCESSOR: Inserted new product for {incoming_url}")
+                        self.rds_manager.update_record(
+                            "UPDATE militaria SET url = %s, date_modified = %s WHERE id = %s;",
+                            (incoming_url, now, matched_id)
+                        )
+                        logging.info(f"DETAIL PROCESSOR: DB URL updated for id={matched_id}")
                     except Exception as e:
-                        logging.error(f"DETAIL PROCESSOR: new_product_processor failed for {incoming_url}: {e}")
+                        logging.error(f"DETAIL PROCESSOR: Failed to update URL for id={matched_id}: {e}")
 
-            except Exception as e:
-                final_url = clean_details.get("url")
-                logging.error(f"DETAIL PROCESSOR: final insert/update step failed for {final_url}: {e}")
+            if matched_id:
+                clean_details['url'] = incoming_url
+                old_price = db_price_float
+                new_price = clean_details.get("price")
+                is_sold = clean_details.get("available") is False
 
-        logging.info("DETAIL PROCESSOR: Finished processing all products")
+                if is_sold and not self._meaningful_price_change(old_price, new_price):
+                    logging.info(f"DETAIL PROCESSOR: Skipping unchanged sold item: {incoming_url}")
+                    self.counter.add_skipped_sold_item()
+                    return
+
+                logging.info(f"DETAIL PROCESSOR: Found existing record (id={matched_id}) for {incoming_url}")
+                self.counter.add_old_product_count()
+                did_update = self.old_product_processor(clean_details, matched_id, now)
+                if did_update:
+                    logging.info(f"DETAIL PROCESSOR: Updated old product id={matched_id}")
+                else:
+                    logging.info(f"DETAIL PROCESSOR: No detail changes for id={matched_id}")
+
+            elif new_id:
+                logging.info(f"DETAIL PROCESSOR: New product detected for {incoming_url}")
+                self.counter.add_new_product_count()
+                try:
+                    self.new_product_processor(clean_details, db_id=new_id)
+                    logging.info(f"DETAIL PROCESSOR: Inserted new product for {incoming_url}")
+                except Exception as e:
+                    logging.error(f"DETAIL PROCESSOR: new_product_processor failed for {incoming_url}: {e}")
+
+        except Exception as e:
+            final_url = clean_details.get("url")
+            logging.error(f"DETAIL PROCESSOR: final insert/update step failed for {final_url}: {e}")
+
+    def flush_pending_updates(self) -> None:
+        """
+        Write the queued old-product updates: one batched statement per set of changed columns.
+        """
+        with self._pending_lock:
+            pending, self._pending_updates = self._pending_updates, {}
+        for columns, params_list in pending.items():
+            query = _update_by_id_sql(columns)
+            # One transaction per page, so a bad row only sends its own page down the slow path.
+            for start in range(0, len(params_list), self.UPDATE_PAGE_SIZE):
+                page = params_list[start:start + self.UPDATE_PAGE_SIZE]
+                try:
+                    self.rds_manager.execute_batch(query, page, page_size=self.UPDATE_PAGE_SIZE)
+                    logging.info(f"OLD PRODUCT: {len(page)} records updated ({', '.join(columns)})")
+                except Exception as e:
+                    # execute_batch has rolled the page back; retry row by row so only the bad rows are lost.
+                    logging.error(f"OLD PRODUCT: batched update failed for {len(page)} records ({', '.join(columns)}), retrying one by one: {e}")
+                    self._update_rows_one_by_one(query, page, columns)
+
+    def _update_rows_one_by_one(self, query: str, params_list: list, columns: tuple) -> None:
+        written = 0
+        for params in params_list:
+            try:
+                self.rds_manager.execute(query, params)
+                written += 1
+            except Exception as e:
+                logging.error(f"OLD PRODUCT: update failed for id={params[-1]} ({', '.join(columns)}): {e}")
+        logging.info(f"OLD PRODUCT: {written}/{len(params_list)} records updated one by one ({', '.join(columns)})")
 
 
-    def new_product_processor(self, clean_details_data: dict, raw_details_data: dict) -> None:
+    def _insert_new_product(self, clean_details_data: dict):
         """
-        Insert a new product, upload its images to S3, then classify with local ML first,
-        falling back to OpenAI automatically when a model is disabled or low-confidence.
+        Insert a new product row and return its id, or None if the insert or ID lookup failed.
         """
         url = clean_details_data.get("url")
-        thumb = None
 
-        # 1) Insert new record
+        # 1) Insert new record (INSERT ... RETURNING id)
         try:
-            self.rds_manager.new_product_input(clean_details_data)
+            db_id = self.rds_manager.new_product_input(clean_details_data)
             logging.info(f"NEW PRODUCT: Inserted {url}")
         except Exception as e:
             logging.error(f"NEW PRODUCT: Failed to insert {url}: {e}")
-            return
+            return None
 
-        # 2) Retrieve its database ID
+        # 2) Retrieve its database ID when the insert didn't return one (e.g. row already existed)
         try:
-            db_id = self.rds_manager.get_record_id(
-                "SELECT id FROM militaria WHERE url = %s AND site = %s;",
-                (url, clean_details_data.get("site"))
-            )
+            if not db_id:
+                db_id = self.rds_manager.get_record_id(
+                    "SELECT id FROM militaria WHERE url = %s AND site = %s;",
+                    (url, clean_details_data.get("site"))
+                )
             if not db_id:
                 logging.error(f"NEW PRODUCT: Couldn't fetch ID for {url}")
-                return
+                return None
         except Exception as e:
             logging.error(f"NEW PRODUCT: ID lookup failed for {url}: {e}")
-            return
+            return None
+        return db_id
+
+    def new_product_processor(self, clean_details_data: dict, db_id=None) -> None:
+        """
+        Insert a new product (unless `db_id` says it already is), upload its images to S3, then
+        classify with local ML first, falling back to OpenAI automatically when a model is
+        disabled or low-confidence.
+        """
+        url = clean_details_data.get("url")
+        thumb = None
+        # Columns written back to the new row in one UPDATE at the end (step 5).
+        updates = {}
+
+        if db_id is None:
+            db_id = self._insert_new_product(clean_details_data)
+            if not db_id:
+                return
 
         # 3) Upload images
         image_urls = clean_details_data.get("original_image_urls", [])
@@ -596,10 +1024,7 @@ class ProductDetailsProcessor:
                 s3_urls = result.get("uploaded_image_urls", [])
                 thumb = result.get("thumbnail_url")
                 if s3_urls:
-                    self.rds_manager.execute(
-                        "UPDATE militaria SET s3_image_urls = %s WHERE id = %s;",
-                        (json.dumps(s3_urls), db_id)
-                    )
+                    updates["s3_image_urls"] = orjson.dumps(s3_urls).decode("utf-8")
                     logging.info(f"NEW PRODUCT: Uploaded {len(s3_urls)} images for {url}")
                 clean_details_data["s3_image_urls"] = s3_urls
             except Exception as e:
@@ -611,7 +1036,6 @@ class ProductDetailsProcessor:
         title = (clean_details_data.get("title") or "")
         description = (clean_details_data.get("description") or "")
 
-        updates = {}
         try:
             labels = self._predict_labels(title=title, description=description, image_url=thumb)
 
@@ -649,28 +1073,31 @@ class ProductDetailsProcessor:
         # 5) Persist whatever we got
         if updates:
             try:
-                set_clause = ", ".join(f"{k} = %s" for k in updates.keys())
-                params = list(updates.values()) + [db_id]
-                self.rds_manager.execute(f"UPDATE militaria SET {set_clause} WHERE id = %s;", tuple(params))
-                logging.info(f"NEW PRODUCT: Classification fields updated for {url} ({', '.join(updates.keys())})")
+                params = tuple(updates.values()) + (db_id,)
+                self.rds_manager.execute(_update_by_id_sql(tuple(updates)), params)
+                logging.info(f"NEW PRODUCT: Image/classification fields updated for {url} ({', '.join(updates.keys())})")
             except Exception as e:
-                logging.error(f"NEW PRODUCT: Failed to store classification for {url}: {e}")
+                logging.error(f"NEW PRODUCT: Failed to store image/classification fields for {url}: {e}")
 
 
 
-    def old_product_processor(self, clean: dict, record_id: int) -> bool:
+    def old_product_processor(self, clean: dict, record_id: int, now: str = None) -> bool:
         """
         Update an existing product’s record if any key details have changed.
         Guards against overwriting a real price with 0/None.
-        Returns True if an UPDATE was executed, False otherwise.
+        The UPDATE is queued and written by flush_pending_updates.
+        Returns True if an UPDATE was queued, False otherwise.
+        `now` is the batch timestamp from product_details_processor_main.
         """
-        now = datetime.now(timezone.utc).isoformat()
+        now = now or datetime.now(timezone.utc).isoformat()
 
         try:
             row = self.rds_manager.fetch(
                 """
                 SELECT title, price, available, description,
-                    price_history, original_image_urls, extracted_id
+                    price_history -> -1, original_image_urls, extracted_id,
+                    nation_site_designated, conflict_site_designated,
+                    item_type_site_designated, grade, categories_site_designated
                 FROM militaria
                 WHERE id = %s
                 """,
@@ -681,12 +1108,21 @@ class ProductDetailsProcessor:
                 return False
 
             (db_title, db_price, db_avail, db_desc,
-            db_history, db_images, db_extracted_id) = row[0]
+            db_last_history, db_images, db_extracted_id) = row[0][:7]
+            # Same order as METADATA_FIELDS.
+            db_metadata = row[0][7:]
+
+            # Incoming values, read once
+            get = clean.get
+            raw_input_title = get("title") or ""
+            new_desc        = get("description")
+            new_price_raw   = get("price")
+            new_avail       = get("available")
+            new_images      = get("original_image_urls") or []
 
             updates = {}
 
             # ---------- TITLE & DESCRIPTION ----------
-            raw_input_title = clean.get("title") or ""
             new_title = CleanData.clean_title(raw_input_title)
             logging.debug("TITLE COMPARISON:\nDB   : %r\nCLEAN: %r", db_title, new_title)
             if new_title and new_title != db_title:
@@ -706,14 +1142,11 @@ class ProductDetailsProcessor:
                     logging.info(f"OLD PRODUCT: title changed (fallback path) for id={record_id}")
 
 
-            new_desc = clean.get("description")
             if new_desc and new_desc != db_desc:
                 updates["description"] = new_desc
-                logging.info(f"OLD PRODUCT: description changed for id={record_id}")
+                logging.debug("OLD PRODUCT: description changed for id=%s", record_id)
 
             # ---------- PRICE & HISTORY ----------
-            new_price_raw = clean.get("price")
-
             def to_float(v):
                 try:
                     return float(v) if v is not None else None
@@ -730,49 +1163,44 @@ class ProductDetailsProcessor:
             )
 
             if price_changed:
-                try:
-                    history = json.loads(db_history) if isinstance(db_history, str) else (db_history or [])
-                except Exception:
-                    history = []
-
+                # Only the last history entry is read; a new one is appended in SQL, so the
+                # full history is never parsed or re-serialized here.
                 if db_price_val is not None:
-                    if not history or history[-1].get("price") != db_price_val:
-                        history.append({"price": db_price_val, "date": now})
+                    if not isinstance(db_last_history, dict) or db_last_history.get("price") != db_price_val:
+                        updates["price_history"] = orjson.dumps([{"price": db_price_val, "date": now}]).decode("utf-8")
 
                 updates["price"] = new_price_val
-                updates["price_history"] = json.dumps(history)
-                logging.info(f"OLD PRODUCT: price changed for id={record_id} (from {db_price_val} to {new_price_val})")
+                logging.debug("OLD PRODUCT: price changed for id=%s (from %s to %s)", record_id, db_price_val, new_price_val)
             else:
                 logging.debug("PRICE GUARD: skipping price update for id=%s (db_price=%r, new_price=%r)",
                             record_id, db_price_val, new_price_val)
 
             # ---------- AVAILABILITY ----------
-            new_avail = clean.get("available")
             if new_avail is not None and new_avail != db_avail:
                 updates["available"] = new_avail
                 updates["last_seen"] = now
                 updates["date_sold"] = None if new_avail else now
-                logging.info(f"OLD PRODUCT: availability changed for id={record_id}")
+                logging.debug("OLD PRODUCT: availability changed for id=%s", record_id)
 
             # ---------- IMAGES ----------
-            new_images = clean.get("original_image_urls") or []
             try:
                 old_images = json.loads(db_images) if isinstance(db_images, str) else (db_images or [])
             except Exception:
                 old_images = []
             if new_images and new_images != old_images:
-                updates["original_image_urls"] = json.dumps(new_images)
-                logging.info(f"OLD PRODUCT: images updated for id={record_id}")
+                updates["original_image_urls"] = orjson.dumps(new_images).decode("utf-8")
+                logging.debug("OLD PRODUCT: images updated for id=%s", record_id)
 
             # ---------- OTHER METADATA ----------
-            for field in [
-                "nation_site_designated", "conflict_site_designated",
-                "item_type_site_designated", "grade", "categories_site_designated"
-            ]:
-                val = clean.get(field)
-                if val:
-                    updates[field] = json.dumps(val) if isinstance(val, list) else val
-                    logging.info(f"OLD PRODUCT: {field} updated for id={record_id}")
+            for field, db_val in zip(self.METADATA_FIELDS, db_metadata):
+                val = get(field)
+                if not val or val == db_val:
+                    continue
+                encoded = orjson.dumps(val).decode("utf-8") if isinstance(val, list) else val
+                if encoded == db_val:
+                    continue
+                updates[field] = encoded
+                logging.debug("OLD PRODUCT: %s updated for id=%s", field, record_id)
 
             # ---------- NOTHING CHANGED ----------
             if not updates:
@@ -783,23 +1211,16 @@ class ProductDetailsProcessor:
             updates["date_modified"] = now
             updates.setdefault("last_seen", now)
 
-            set_clause = ", ".join(f"{k} = %s" for k in updates)
-            params = list(updates.values()) + [record_id]
-            query = f"UPDATE militaria SET {set_clause} WHERE id = %s"
-
-            # Prefer rowcount if available
-            try:
-                rows = self.rds_manager.update_record(query, params)
-            except TypeError:
-                self.rds_manager.update_record(query, params)
-                rows = 1
-
-            if rows:
-                logging.info(f"OLD PRODUCT: record id={record_id} updated successfully ({rows} row)")
-                return True
-            else:
-                logging.warning(f"OLD PRODUCT: UPDATE touched 0 rows for id={record_id} (possible mismatch?)")
-                return False
+            # Same column set → same statement, so these batch together at flush time.
+            params = tuple(updates.values()) + (record_id,)
+            with self._pending_lock:
+                self._pending_updates.setdefault(tuple(updates), []).append(params)
+            # One record per product; the changed columns travel as structured fields.
+            logging.info(
+                "OLD PRODUCT: update queued for id=%s (%s)", record_id, ", ".join(updates),
+                extra={"record_id": record_id, "changed_columns": tuple(updates)}
+            )
+            return True
 
         except Exception as e:
             logging.error(f"OLD PRODUCT: failed to process id={record_id}: {e}")
@@ -838,10 +1259,12 @@ class ProductDetailsProcessor:
                     val = " ".join(val)
                 return normalize_input(val)
 
-            # Locate the extraction method on soup
+            # Locate the extraction method on soup (a caller-supplied limit keeps the list method)
+            if "limit" not in kwargs:
+                method = _FIRST_MATCH_METHODS.get(method, method)
             extractor = getattr(soup, method, None)
             if not extractor:
-                logging.debug(f"EXTRACT DATA: no such method '{method}' on soup")
+                logging.debug("EXTRACT DATA: no such method '%s' on soup", method)
                 return None
 
             element = extractor(*args, **kwargs)
@@ -869,7 +1292,7 @@ class ProductDetailsProcessor:
             return attr_val.strip() if attr_val else None
 
         except Exception as e:
-            logging.error(f"EXTRACT DATA: unexpected error in {method} → {e}")
+            logging.error("EXTRACT DATA: unexpected error in %s → %s", method, e)
             return None
 
     def extract_details_title(self, soup) -> str | None:
@@ -894,9 +1317,10 @@ class ProductDetailsProcessor:
         title = normalize_input(raw)
 
         # 5) Post-process if requested
-        if title and config.get("post_process"):
+        post_process = config.get("post_process")
+        if title and post_process:
             try:
-                title = apply_post_processors(title, config["post_process"])
+                title = apply_post_processors(title, post_process)
             except Exception as e:
                 logging.error(f"DETAILS TITLE: post-process failed → {e}")
 
@@ -942,9 +1366,10 @@ class ProductDetailsProcessor:
             desc = normalize_input(raw)
 
             # 7) Post-process if configured
-            if desc and config.get("post_process"):
+            post_process = config.get("post_process")
+            if desc and post_process:
                 try:
-                    desc = apply_post_processors(desc, config["post_process"], soup=soup)
+                    desc = apply_post_processors(desc, post_process, soup=soup)
                 except Exception as e:
                     logging.error(f"DETAILS DESC: post-process failed → {e}")
 
@@ -973,13 +1398,10 @@ class ProductDetailsProcessor:
             # 4) Normalize the extracted value (e.g. strip whitespace, handle None)
             norm = normalize_input(raw)
             # 5) Apply any post-processors, injecting context if needed
-            if norm and config.get("post_process"):
-                # Ensure each post-processor has soup & url contexts
-                for proc in config["post_process"].values():
-                    if isinstance(proc, dict):
-                        proc.setdefault("soup", soup)
-                        proc.setdefault("url", product_url)
-                norm = apply_post_processors(norm, config["post_process"], soup=soup)
+            if norm and self._price_post_process:
+                # The site config is shared by every worker, so this product's soup & url travel
+                # as call context instead of being written into it.
+                norm = self._price_post_process(norm, soup, {"soup": soup, "url": product_url})
 
             # 6) Always return a string; default to "0" when empty
             return str(norm) if norm else "0"
@@ -1052,9 +1474,10 @@ class ProductDetailsProcessor:
         val = normalize_input(raw)
 
         # 4) Post-process if needed
-        if val and config.get("post_process"):
+        post_process = config.get("post_process")
+        if val and post_process:
             try:
-                val = apply_post_processors(val, config["post_process"], soup=soup)
+                val = apply_post_processors(val, post_process, soup=soup)
             except Exception as e:
                 logging.error(f"DETAILS AVAILABILITY: post-process failed → {e}")
 
@@ -1067,24 +1490,35 @@ class ProductDetailsProcessor:
         return False
 
 
-    def extract_details_image_url(self, soup) -> list[str]:
+    def _resolve_image_extractor(self):
         """
-        Extract image URLs via a configured function. Returns [] if no function is set
-        or if extraction fails.
+        Look up the configured image extractor. Returns (name, function), with function
+        None when there is no config, an explicit "skip", or an unknown name.
         """
         cfg = self.details_selectors.get("details_image_url")
         if not cfg:
-            return []
+            return None, None
 
         fn = cfg.get("function")
         # explicit “skip” or missing → no images
         if not isinstance(fn, str) or fn.lower() == "skip":
-            return []
+            return fn, None
 
         extractor = getattr(image_extractor, fn, None)
         if not extractor:
             logging.error(f"IMAGE URL: extractor '{fn}' not found")  # :contentReference[oaicite:0]{index=0}
+            return fn, None
+        return fn, extractor
+
+    def extract_details_image_url(self, soup) -> list[str]:
+        """
+        Extract image URLs via a configured function. Returns [] if no function is set
+        or if extraction fails.
+        """
+        extractor = self._image_extractor
+        if extractor is None:
             return []
+        fn = self._image_extractor_name
 
         try:
             urls = extractor(soup)
@@ -1114,9 +1548,10 @@ class ProductDetailsProcessor:
         raw = self.extract_data(soup, method, args or [], kwargs or {}, attr, cfg)
         val = normalize_input(raw)
 
-        if val and cfg.get("post_process"):
+        post_process = cfg.get("post_process")
+        if val and post_process:
             try:
-                val = apply_post_processors(val, cfg["post_process"], soup=soup)
+                val = apply_post_processors(val, post_process, soup=soup)
             except Exception as e:
                 logging.error(f"NATION: post-process failed → {e}")
 
@@ -1138,9 +1573,10 @@ class ProductDetailsProcessor:
             raw = self.extract_data(soup, method, args or [], kwargs or {}, attr, cfg)
             val = normalize_input(raw)
 
-            if val and cfg.get("post_process"):
+            post_process = cfg.get("post_process")
+            if val and post_process:
                 try:
-                    val = apply_post_processors(val, cfg["post_process"], soup=soup)
+                    val = apply_post_processors(val, post_process, soup=soup)
                 except Exception as e:
                     logging.error(f"CONFLICT: post-process failed → {e}")
 
@@ -1164,9 +1600,10 @@ class ProductDetailsProcessor:
         try:
             raw = self.extract_data(soup, method, args or [], kwargs or {}, attr, cfg)
             val = normalize_input(raw)
-            if val and cfg.get("post_process"):
+            post_process = cfg.get("post_process")
+            if val and post_process:
                 try:
-                    val = apply_post_processors(val, cfg["post_process"], soup=soup)
+                    val = apply_post_processors(val, post_process, soup=soup)
                 except Exception as e:
                     logging.error(f"ITEM_TYPE: post-process failed → {e}")
             return val or None
@@ -1189,9 +1626,10 @@ class ProductDetailsProcessor:
         try:
             raw = self.extract_data(soup, method, args or [], kwargs or {}, attr, cfg)
             val = normalize_input(raw)
-            if val and cfg.get("post_process"):
+            post_process = cfg.get("post_process")
+            if val and post_process:
                 try:
-                    val = apply_post_processors(val, cfg["post_process"], soup=soup)
+                    val = apply_post_processors(val, post_process, soup=soup)
                 except Exception as e:
                     logging.error(f"EXTRACTED_ID: post-process failed → {e}")
             return val or None
@@ -1214,9 +1652,10 @@ class ProductDetailsProcessor:
         try:
             raw = self.extract_data(soup, method, args or [], kwargs or {}, attr, cfg)
             val = normalize_input(raw)
-            if val and cfg.get("post_process"):
+            post_process = cfg.get("post_process")
+            if val and post_process:
                 try:
-                    val = apply_post_processors(val, cfg["post_process"], soup=soup)
+                    val = apply_post_processors(val, post_process, soup=soup)
                 except Exception as e:
                     logging.error(f"GRADE: post-process failed → {e}")
             return val or None
@@ -1241,8 +1680,9 @@ class ProductDetailsProcessor:
 
             categories = normalize_input(categories)
 
-            if categories and "post_process" in selector_config:
-                categories = apply_post_processors(categories, selector_config["post_process"])
+            post_process = selector_config.get("post_process")
+            if categories and post_process:
+                categories = apply_post_processors(categories, post_process)
 
             return categories if categories else []
 
@@ -1262,46 +1702,46 @@ class ProductDetailsProcessor:
         Returns:
             tuple: (method, args, kwargs, attribute, full_config)
         """
-        try:
-            config = self.details_selectors.get(selector_key)
-            if config is None:
-                logging.debug(f"PRODUCT PROCESSOR: No selector config found for key: {selector_key}")
-                return None, None, None, None, {}
+        cached = self._details_config_cache.get(selector_key)
+        if cached is not None:
+            return cached
 
-            return (
+        config = self.details_selectors.get(selector_key)
+        if isinstance(config, dict):
+            parsed = (
                 config.get("method", "find"),
                 config.get("args", []),
                 config.get("kwargs", {}),
                 config.get("attribute"),
                 config
             )
-        except Exception as e:
-            logging.error(f"PRODUCT PROCESSOR: Error parsing configuration for {selector_key}: {e}")
-            return None, None, None, None, {}
+        else:
+            # Absent or not a selector dict: cache the empty result, so it is only looked up (and logged) once.
+            if config is None:
+                logging.debug("PRODUCT PROCESSOR: No selector config found for key: %s", selector_key)
+            else:
+                logging.error("PRODUCT PROCESSOR: Selector config for %s is not a dict: %r", selector_key, config)
+            parsed = (None, None, None, None, {})
+        self._details_config_cache[selector_key] = parsed
+        return parsed
 
 
 
         
     def construct_details_data(self, product_url, product_url_soup):
-        # Shortcut to avoid repeating self.details_selectors.get(...)
-        sel = self.details_selectors  
         try:
-            data = {
-                "url": product_url,
-                "title": self.extract_details_title(product_url_soup) if sel.get("details_title") else None,
-                "description": self.extract_details_description(product_url_soup) if sel.get("details_description") else None,
-                "price": self.extract_details_price(product_url_soup, product_url) if sel.get("details_price") else "0",
-                "available": self.extract_details_availability(product_url_soup) if sel.get("details_availability") else None,
-                "original_image_urls": self.extract_details_image_url(product_url_soup) if sel.get("details_image_url") else [],
-                "nation_site_designated": self._static_value_or_extracted("details_nation", self.extract_details_nation, product_url_soup),
-                "conflict_site_designated": self._static_value_or_extracted("details_conflict", self.extract_details_conflict, product_url_soup),
-                "item_type_site_designated": self._static_value_or_extracted("details_item_type", self.extract_details_item_type, product_url_soup),
-                "extracted_id": self.extract_details_extracted_id(product_url_soup) if sel.get("details_extracted_id") else None,
-                "grade": self.extract_details_grade(product_url_soup) if sel.get("details_grade") else None,
-                "categories_site_designated": self.extract_details_site_categories(product_url_soup) if sel.get("details_site_categories") else [],
-            }
+            data = {"url": product_url}
+            for key, default in self._detail_defaults:
+                data[key] = [] if default is list else default
+            for key, extract in self._detail_extractors:
+                if key == "price":
+                    data[key] = extract(product_url_soup, product_url)
+                else:
+                    # Static string selectors are returned as-is by the extractors themselves.
+                    data[key] = extract(product_url_soup)
 
-            logging.debug(f"CONSTRUCT DETAILS DATA: Extracted fields →\n{pprint.pformat(data)}")
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug("CONSTRUCT DETAILS DATA: Extracted fields →\n%s", pprint.pformat(data))
 
             return data
 
@@ -1327,53 +1767,36 @@ class ProductDetailsProcessor:
         """
         Process and clean details data dynamically.
 
+        Cleans `details_data` in place (values are replaced key by key, no
+        second dict is built), so callers must not reuse the raw dict.
+
         Args:
             details_data (dict): Raw details data.
 
         Returns:
-            dict: Cleaned details data.
+            dict: Cleaned details data (the same object that was passed in).
         """
-        clean_data = CleanData()
-
-        # Map keys to their corresponding cleaning functions
-        cleaning_functions = {
-            "url"                       : clean_data.clean_url,
-            "title"                     : lambda v: clean_data.clean_title(v, allow_empty=True),
-            "description"               : lambda v: clean_data.clean_description(v, allow_empty=True),
-            "price"                     : clean_data.clean_price,
-            "available"                 : clean_data.clean_available,
-            "original_image_urls"       : clean_data.clean_url_list,
-            "nation_site_designated"    : clean_data.clean_nation,
-            "conflict_site_designated"  : clean_data.clean_conflict,
-            "item_type_site_designated" : clean_data.clean_item_type,
-            "extracted_id"              : clean_data.clean_extracted_id,
-            "grade"                     : clean_data.clean_grade,
-            "categories_site_designated": clean_data.clean_categories,
-        }
-
-        cleaned_data = {}
-        for key, value in details_data.items():
-            if key in cleaning_functions:
-                if key == "available" and isinstance(value, bool):
-                    cleaned_value = value  # Avoid double-cleaning
-                else:
-                    cleaned_value = cleaning_functions[key](value)
-                cleaned_data[key] = cleaned_value
-            else:
-                cleaned_data[key] = value  # Preserve unrecognized fields
+        # Fields without a cleaner are left untouched.
+        for key, clean_fn in self._cleaning_pairs:
+            if key not in details_data:
+                continue
+            value = details_data[key]
+            if key == "available" and isinstance(value, bool):
+                continue  # Avoid double-cleaning
+            details_data[key] = clean_fn(value)
 
         # Add consistent metadata
-        cleaned_data.update({
-            "site": self.site_profile.get('source_name', 'unknown'),
-            "currency": self.site_profile.get("access_config", {}).get("currency_code", "usd"),
-        })
+        details_data["site"] = self._site_name
+        details_data["currency"] = self._currency
 
-        return cleaned_data
+        return details_data
 
     
     def convert_decimal_to_float(self,data):
         """
         Recursively convert Decimal objects in a nested structure to float.
+        Returns a converted copy and leaves `data` untouched. Currently unused: new rows
+        get their Decimal conversion in AwsRdsManager.new_product_input.
         
         Args:
             data: The data structure (dict, list, or scalar) to process.
@@ -1416,14 +1839,6 @@ class ProductDetailsProcessor:
                 return value
         return value
 
-    def _static_value_or_extracted(self, key, extractor_func, soup):
-        config = self.details_selectors.get(key)
-        if isinstance(config, str):
-            return config
-        elif isinstance(config, dict):
-            return extractor_func(soup)
-        return None
-
     # --------------ML vs AI Determination Functions--------------
 
     def _predict_labels(self, title: str, description: str, image_url: str | None):
@@ -290,7 +290,7 @@ class TileProcessor:
             # Handle post-process if configured
             if "post_process" in config:
                 for func_name, arg in config["post_process"].items():
-                    func = getattr(post_processors, func_name, None)
+                    func = post_processors.get_processor(func_name)
                     if func and func(element.get_text(strip=True), arg):
                         return True
                 return False  # If post-processing exists but none matched
@@ -305,7 +305,7 @@ class TileProcessor:
                 return True
 
         except Exception as e:
-            print(f"TILE PROCESSOR: Error checking availability: {e}")
+            logging.error("TILE PROCESSOR: Error checking availability: %s", e)
             return False
 
 
@@ -321,8 +321,6 @@ class TileProcessor:
             bool: True if the product is unavailable, False otherwise.
         """
         try:
-            from post_processors import find_text_contains  # or import all as needed
-
             unavailability_keys = ["tile_unavailability_reserved", "tile_unavailability_sold"]
 
             for key in unavailability_keys:
@@ -356,13 +354,13 @@ class TileProcessor:
                 # Check post-processing if defined
                 if "post_process" in config:
                     for func_name, arg in config["post_process"].items():
-                        func = getattr(post_processors, func_name, None)
+                        func = post_processors.get_processor(func_name)
                         if func and func(element.get_text(strip=True), arg):
                             return True
 
             return False
         except Exception as e:
-            print(f"TILE PROCESSOR: Error checking unavailability: {e}")
+            logging.error("TILE PROCESSOR: Error checking unavailability: %s", e)
             return False
 
         
@@ -425,22 +423,8 @@ class TileProcessor:
         ])
 
     def apply_post_processing(self, value, config):
+        # The shared compiled pipeline normalizes text processors' input itself.
         post_process_config = config.get("post_process", None)
         if not post_process_config or not isinstance(post_process_config, dict):
             return value
-
-        for func_name, arg in post_process_config.items():
-            try:
-                func = getattr(post_processors, func_name, None)
-                if func is None:
-                    logging.warning(f"Post-process function '{func_name}' not found.")
-                    continue
-
-                # Handle boolean-style no-arg functions (if you keep any in the future)
-                if isinstance(arg, bool) and arg:
-                    value = func(value)
-                else:
-                    value = func(value, arg)
-            except Exception as e:
-                logging.error(f"Error applying post-processing '{func_name}': {e}")
-        return value
+        return apply_post_processors(value, post_process_config)
@@ -1,7 +1,10 @@
 import logging
+import threading
 
 class ProductsCounter:
     def __init__(self):
+        # Detail workers bump the product counters concurrently.
+        self._lock = threading.Lock()
         self.reset_all_counts()
         # empty_page_tolerance has been replaced by targetMatch but need to double check it first
         # self.empty_page_tolerance = 5
@@ -46,8 +49,9 @@ class ProductsCounter:
         return self.new_products_count
 
     def add_new_product_count(self, count=1):
-        self.new_products_count += count
-        self.update_total_products_count()
+        with self._lock:
+            self.new_products_count += count
+            self.update_total_products_count()
 
     def reset_new_products_count(self):
         self.new_products_count = 0
@@ -57,8 +61,9 @@ class ProductsCounter:
         return self.old_products_count
 
     def add_old_product_count(self, count=1):
-        self.old_products_count += count
-        self.update_total_products_count()
+        with self._lock:
+            self.old_products_count += count
+            self.update_total_products_count()
 
     def reset_old_products_count(self):
         self.old_products_count = 0
@@ -117,6 +122,7 @@ class ProductsCounter:
         self.price_update_count += count
 
     def add_skipped_sold_item(self):
-        if not hasattr(self, 'skipped_sold'):
-            self.skipped_sold = 0
-        self.skipped_sold += 1
\ No newline at end of file
+        with self._lock:
+            if not hasattr(self, 'skipped_sold'):
+                self.skipped_sold = 0
+            self.skipped_sold += 1
\ No newline at end of file
@@ -14,7 +14,7 @@ from products_counter import ProductsCounter
 from site_processor import SiteProcessor
 from html_manager import HtmlManager
 from logging_manager import adjust_logging_level
-from openai_api_manager import OpenAIManager
+from openai_api_manager import get_manager
 from ml_manager import MLManager
 
 # Default Settings
@@ -43,9 +43,11 @@ DEFAULT_RDS_SETTINGS = {
 
     # OpenAI Settings
     "openaiCred"               : "/home/ec2-user/milivault/credentials/chatgpt_api_key.json",
-    "openaiModel"              : "gpt-5",
-    "openaiFallbackModel"      : "gpt-5-mini",
-    "openaiConfidenceThreshold": 0.90
+    "openaiModel"              : "gpt-5-mini",
+    "openaiFallbackModel"      : "gpt-5",
+    "openaiConfidenceThreshold": 0.90,
+    "openaiCachePath"          : "/home/ec2-user/milivault/cache/openai_cache.sqlite",
+    "openaiBatchStatePath"     : "/home/ec2-user/milivault/cache/openai_batches.json"
     }
 
 DEFAULT_PC_SETTINGS = {
@@ -73,9 +75,11 @@ DEFAULT_PC_SETTINGS = {
 
     # OpenAI Settings
     "openaiCred"              : r'C:/Users/keena/Desktop/Milivault/credentials/chatgpt_api_key.json',
-    "openaiModel"             : "gpt-5",
-    "openaiFallbackModel"     : "gpt-5-mini",
-    "openaiConfidenceThreshold": 0.90
+    "openaiModel"             : "gpt-5-mini",
+    "openaiFallbackModel"     : "gpt-5",
+    "openaiConfidenceThreshold": 0.90,
+    "openaiCachePath"         : r'C:/Users/keena/Desktop/Milivault/cache/openai_cache.sqlite',
+    "openaiBatchStatePath"    : r'C:/Users/keena/Desktop/Milivault/cache/openai_batches.json'
 }
 
 def load_user_settings():
@@ -118,7 +122,7 @@ def setup_object_managers(user_settings):
     """
     try:
         # Initialize independent managers
-        openai_manager = OpenAIManager(user_settings)
+        openai_manager = get_manager(user_settings)
         ml_manager = MLManager(user_settings, openai_manager=openai_manager)  # ← NEW
 
         rds_manager = AwsRdsManager(
@@ -141,10 +141,11 @@ class SiteProcessor:
             # This is for updating any products that have been seen but not requiring updates with the last_seen date.
             try:
                 all_tile_urls = {p["url"] for p in tile_product_data_list if "url" in p}
-                touched_urls = {p["url"] for p in processing_required_list + availability_update_list if "url" in p}
+                touched_urls = {p["url"] for p in processing_required_list if "url" in p}
+                touched_urls.update(availability_update_list)
                 untouched_urls = all_tile_urls - touched_urls
 
-                # Keep only ones known to exist in the DB (comparison_list[url][-1] == True)
+                # Keep only ones known to exist in the DB (comparison_list[url].in_db)
                 self.rds_manager.update_last_seen_bulk(list(untouched_urls))
 
             except Exception as e: